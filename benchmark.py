@@ -0,0 +1,385 @@
+# 日志与进度管线的无界面性能测试
+#
+# 在 offscreen Qt 平台下运行，不需要显示器：
+#     python benchmark.py                      # 结果以JSON输出到标准输出
+#     python benchmark.py --output bench.json  # 写入文件，便于对比回归
+#
+# 测试项：
+#   generator - LogGenerator 不等待时的产出速度（行/秒）
+#   append    - MainWindow.append_logs 追加单个日志条目的耗时随缓冲区行数增长的变化（p50/p99）
+#   pipeline  - 生成线程全速跨线程投递到界面时的吞吐量和事件循环延迟
+#   progress  - 一个窗口中大量进度条每帧都更新数值时，每帧更新和重绘的耗时（p50/p99）
+# 另外记录进程的峰值内存（RSS）。
+#
+# 长时间运行测试（--soak）：以很高的速度倍数完整模拟一次长时间执行（默认24小时，720倍速约2分钟），
+# 定期采样常驻内存和CPU时间，确认两者在预热之后不随运行时间增长；不满足时以非零状态退出：
+#     python benchmark.py --soak --soak-hours 24 --soak-speed 720
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout
+from PyQt5.QtCore import Qt, QThread, QTimer, QT_VERSION_STR, PYQT_VERSION_STR
+
+from chen_ai_simulation import (
+    LogGenerator, MainWindow, ProgressBar, SimulationScheduler, DEFAULT_MAX_LOG_LINES, PROGRESS_CHUNK_COLORS
+)
+
+BENCH_MODE = '正在编译中，请勿关闭窗口'
+BENCH_DURATION = 3600  # seconds，只用于构建窗口，不会真正计时
+# 固定种子，每次测试生成相同的日志序列，结果可以直接比较
+BENCH_SEED = 0
+# 长时间运行测试的判定：跳过开头的预热部分（缓存和日志缓冲区填满），
+# 之后的内存增长不超过容差，后四分之一的CPU占用不超过前四分之一的倍数
+SOAK_WARMUP_FRACTION = 0.25
+SOAK_RSS_TOLERANCE_BYTES = 16 * 1024 * 1024
+SOAK_CPU_TOLERANCE = 1.5
+# progress测试：进度条网格的列数和窗口大小
+PROGRESS_GRID_COLUMNS = 4
+PROGRESS_GRID_SIZE = (1200, 900)  # pixels
+
+class BenchClock:
+    # 性能测试不按真实时间推进，日志生成只需要一个固定的时钟
+    def elapsed(self):
+        return 0.0
+
+class FloodThread(QThread):
+    # 忽略所有等待，全速驱动 LogGenerator，通过排队信号投递给界面线程
+    # 在途批次数量受信号量限制，避免界面跟不上时事件队列无限增长
+    def __init__(self, generator, max_in_flight=8):
+        super().__init__()
+        self.generator = generator
+        self.running = True
+        self.in_flight = threading.Semaphore(max_in_flight)
+        # 直接连接：在生成线程里、发送批次的同时占用一个在途名额
+        self.generator.new_logs.connect(self.throttle, Qt.DirectConnection)
+
+    def throttle(self, entries, extra):
+        while self.running and not self.in_flight.acquire(timeout=0.05):
+            pass
+
+    def run(self):
+        steps = self.generator.steps(BenchClock())
+        while self.running:
+            next(steps)
+
+    def stop(self):
+        self.running = False
+        self.wait()
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def windows_memory_counters():
+    # 通过 GetProcessMemoryInfo 读取内存计数，失败时返回None
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return counters
+    return None
+
+def peak_rss_bytes():
+    # Linux/macOS 使用 getrusage，Windows 读取峰值工作集
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 单位是字节，Linux 是KB
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if sys.platform == 'win32':
+        counters = windows_memory_counters()
+        return counters.PeakWorkingSetSize if counters else None
+    return None
+
+def current_rss_bytes():
+    # 当前常驻内存：Linux 读取 /proc，Windows 读取工作集，其他平台只能退回峰值
+    if os.path.exists('/proc/self/statm'):
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    if sys.platform == 'win32':
+        counters = windows_memory_counters()
+        return counters.WorkingSetSize if counters else None
+    return peak_rss_bytes()
+
+def collect_entries(count):
+    # 预先生成一批真实的日志条目，每个单独打包成一批，供append测试使用；
+    # 动态片段的条目指向所在批次的额外文本，继续共用原来的额外文本列表
+    generator = LogGenerator(BENCH_DURATION, seed=BENCH_SEED)
+    entries = []
+    generator.new_logs.connect(lambda batch, extra: entries.extend(([entry], extra) for entry in batch))
+    steps = generator.steps(BenchClock())
+    while len(entries) < count:
+        next(steps)
+    generator.finish(BenchClock())
+    return entries[:count]
+
+def bench_generator(lines):
+    generator = LogGenerator(BENCH_DURATION, seed=BENCH_SEED)
+    produced = [0]
+    generator.new_logs.connect(lambda batch, extra: produced.__setitem__(0, produced[0] + len(batch)))
+    steps = generator.steps(BenchClock())
+
+    start = time.perf_counter()
+    while produced[0] < lines:
+        next(steps)
+    generator.finish(BenchClock())
+    seconds = time.perf_counter() - start
+
+    return {
+        'lines': produced[0],
+        'seconds': seconds,
+        'lines_per_sec': produced[0] / seconds,
+    }
+
+def bench_append(app, lines, bucket, max_log_lines):
+    window = MainWindow(BENCH_MODE, BENCH_DURATION, True, True, max_log_lines, autostart=False)
+    window.show()
+    app.processEvents()
+
+    # 追加只写入日志区域的环形缓冲区，滚动和重绘由渲染节拍每帧完成一次，两部分分别计时：
+    # append是追加本身和随后的事件处理，frame是每行之后立即渲染一帧（更新滚动范围并同步重绘）的耗时，
+    # 相当于每帧只到来一行的最坏情况，日志区域排版和绘制的退化体现在这里
+    view = window.code_text
+    buckets = []
+    append_latencies = []
+    frame_latencies = []
+    for index, (batch, extra) in enumerate(collect_entries(lines), 1):
+        start = time.perf_counter()
+        window.append_logs(batch, extra)
+        app.processEvents()
+        appended = time.perf_counter()
+        view.render_frame()
+        view.viewport().repaint()
+        end = time.perf_counter()
+        append_latencies.append((appended - start) * 1000)
+        frame_latencies.append((end - appended) * 1000)
+        if index % bucket == 0:
+            buckets.append({
+                'lines_appended': index,
+                'document_lines': view.line_count(),
+                'append_p50_ms': percentile(append_latencies, 0.50),
+                'append_p99_ms': percentile(append_latencies, 0.99),
+                'frame_p50_ms': percentile(frame_latencies, 0.50),
+                'frame_p99_ms': percentile(frame_latencies, 0.99),
+            })
+            append_latencies = []
+            frame_latencies = []
+
+    window.close()
+    return {'max_log_lines': max_log_lines, 'buckets': buckets}
+
+def bench_pipeline(app, seconds, max_log_lines, probe_interval=10):
+    window = MainWindow(BENCH_MODE, BENCH_DURATION, True, True, max_log_lines, autostart=False)
+    window.show()
+
+    generator = LogGenerator(BENCH_DURATION, seed=BENCH_SEED)
+    flood = FloodThread(generator)
+    delivered = [0]
+
+    def on_logs(batch, extra):
+        window.append_logs(batch, extra)
+        delivered[0] += len(batch)
+        flood.in_flight.release()
+
+    generator.new_logs.connect(on_logs)
+    generator.module_change.connect(window.change_module)
+
+    # 事件循环延迟：固定间隔的计时器实际触发时间与预期的差值
+    lags = []
+    last_tick = [None]
+
+    def probe():
+        now = time.perf_counter()
+        if last_tick[0] is not None:
+            lags.append(max(0.0, (now - last_tick[0]) * 1000 - probe_interval))
+        last_tick[0] = now
+
+    timer = QTimer()
+    timer.setInterval(probe_interval)
+    timer.timeout.connect(probe)
+    timer.start()
+
+    start = time.perf_counter()
+    flood.start()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    flood.stop()
+    elapsed = time.perf_counter() - start
+    lines_delivered = delivered[0]
+    timer.stop()
+    # 已投递但还在事件队列中的批次在窗口关闭前处理掉，不留给之后的测试
+    app.processEvents()
+    window.close()
+
+    return {
+        'seconds': elapsed,
+        'lines_delivered': lines_delivered,
+        'lines_per_sec': lines_delivered / elapsed,
+        'event_loop_lag_ms': {
+            'probe_interval_ms': probe_interval,
+            'p50': percentile(lags, 0.50),
+            'p99': percentile(lags, 0.99),
+            'max': max(lags) if lags else None,
+        },
+    }
+
+def bench_progress(app, bars, frames):
+    # 进度条排成网格（类似每个模块一个进度条），每帧每个进度条前进1%，到100%后从0重新开始
+    grid = QWidget()
+    layout = QGridLayout(grid)
+    progress_bars = []
+    for index in range(bars):
+        bar = ProgressBar(PROGRESS_CHUNK_COLORS[index % len(PROGRESS_CHUNK_COLORS)])
+        layout.addWidget(bar, index // PROGRESS_GRID_COLUMNS, index % PROGRESS_GRID_COLUMNS)
+        progress_bars.append(bar)
+    grid.resize(*PROGRESS_GRID_SIZE)
+    grid.show()
+    app.processEvents()
+
+    latencies = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        for index, bar in enumerate(progress_bars):
+            bar.setValue((frame + index) % 101)
+        app.processEvents()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    grid.close()
+    return {
+        'bars': bars,
+        'frames': frames,
+        'frame_p50_ms': percentile(latencies, 0.50),
+        'frame_p99_ms': percentile(latencies, 0.99),
+    }
+
+def bench_soak(app, hours, speed, sample_count, max_log_lines):
+    duration = hours * 3600
+    scheduler = SimulationScheduler(duration)
+    scheduler.set_speed(speed)
+    window = MainWindow(BENCH_MODE, duration, True, True, max_log_lines, scheduler=scheduler, seed=BENCH_SEED)
+    window.show()
+
+    # 每个采样点：(模拟时间, 常驻内存, 本区间的CPU秒数, 日志行数)
+    samples = []
+    last_cpu = [time.process_time()]
+
+    def sample():
+        cpu = time.process_time()
+        samples.append((scheduler.scheduler.elapsed(), current_rss_bytes(), cpu - last_cpu[0],
+                        window.code_text.line_count()))
+        last_cpu[0] = cpu
+
+    timer = QTimer()
+    timer.setInterval(max(1, int(duration / speed / sample_count * 1000)))
+    timer.timeout.connect(sample)
+    timer.start()
+    scheduler.finished.connect(app.quit)
+
+    start = time.perf_counter()
+    scheduler.start()
+    app.exec_()
+    seconds = time.perf_counter() - start
+    timer.stop()
+    window.close()
+
+    # 预热之后：内存以预热结束时为基准，CPU比较第二个四分之一和最后四分之一
+    steady = samples[int(len(samples) * SOAK_WARMUP_FRACTION):]
+    quarter = max(1, len(samples) // 4)
+    baseline_rss = steady[0][1]
+    final_rss = max(rss for _, rss, _, _ in steady)
+    early_cpu = sum(cpu for _, _, cpu, _ in samples[quarter:2 * quarter]) / quarter
+    late_cpu = sum(cpu for _, _, cpu, _ in samples[-quarter:]) / quarter
+    rss_growth = final_rss - baseline_rss
+    memory_flat = rss_growth <= SOAK_RSS_TOLERANCE_BYTES
+    cpu_flat = late_cpu <= early_cpu * SOAK_CPU_TOLERANCE + 0.005
+
+    return {
+        'simulated_hours': hours,
+        'speed': speed,
+        'seconds': seconds,
+        'samples': len(samples),
+        'log_lines': samples[-1][3] if samples else 0,
+        'rss_bytes': {'baseline': baseline_rss, 'max_after_warmup': final_rss, 'growth': rss_growth},
+        'cpu_seconds_per_sample': {'early': early_cpu, 'late': late_cpu},
+        'memory_flat': memory_flat,
+        'cpu_flat': cpu_flat,
+        'passed': memory_flat and cpu_flat,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='日志与进度管线的无界面性能测试')
+    parser.add_argument('--generator-lines', type=int, default=200000, help='generator测试生成的行数')
+    parser.add_argument('--append-lines', type=int, default=20000, help='append测试追加的行数')
+    parser.add_argument('--bucket', type=int, default=2000, help='append测试每隔多少行统计一次延迟')
+    parser.add_argument('--pipeline-seconds', type=float, default=5.0, help='pipeline测试持续的秒数')
+    parser.add_argument('--max-log-lines', type=int, default=DEFAULT_MAX_LOG_LINES, help='日志区域保留的最大行数')
+    parser.add_argument('--progress-bars', type=int, default=64, help='progress测试的进度条数量')
+    parser.add_argument('--progress-frames', type=int, default=600, help='progress测试更新的帧数')
+    parser.add_argument('--soak', action='store_true', help='只运行长时间运行测试')
+    parser.add_argument('--soak-hours', type=float, default=24, help='长时间运行测试模拟的小时数')
+    parser.add_argument('--soak-speed', type=float, default=720, help='长时间运行测试的速度倍数')
+    parser.add_argument('--soak-samples', type=int, default=200, help='长时间运行测试的采样次数')
+    parser.add_argument('--output', help='结果写入的JSON文件，默认输出到标准输出')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'pyqt': PYQT_VERSION_STR,
+            'platform': platform.platform(),
+            'qpa': app.platformName(),
+        },
+    }
+    if args.soak:
+        results['soak'] = bench_soak(app, args.soak_hours, args.soak_speed, args.soak_samples, args.max_log_lines)
+    else:
+        results['generator'] = bench_generator(args.generator_lines)
+        results['append'] = bench_append(app, args.append_lines, args.bucket, args.max_log_lines)
+        results['pipeline'] = bench_pipeline(app, args.pipeline_seconds, args.max_log_lines)
+        results['progress'] = bench_progress(app, args.progress_bars, args.progress_frames)
+    results['peak_rss_bytes'] = peak_rss_bytes()
+
+    report = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+    if args.soak and not results['soak']['passed']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
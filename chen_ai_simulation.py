@@ -1,273 +1,1082 @@
+import os
 import sys
+import json
+import math
 import time
-import random
-import threading
+import struct
+import argparse
+
+# 程序开始加载的时刻，用于统计从启动到配置窗口首次绘制的耗时
+STARTUP_TIME = time.perf_counter()
+
+import bisect
+from collections import deque
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QComboBox, 
     QSpinBox, QCheckBox, QPushButton, QVBoxLayout, QHBoxLayout, 
-    QProgressBar, QTextEdit, QMessageBox, QDialog
+    QSizePolicy, QAbstractScrollArea, QFileDialog, QMessageBox
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread
-from PyQt5.QtGui import QFont, QColor, QTextCursor, QTextCharFormat
+from PyQt5.QtCore import Qt, QTimer, QEvent, QPointF, QRect, QRectF, QSize, pyqtSignal, QObject, QThread
+from PyQt5.QtGui import QFont, QColor, QPen, QPainter, QPixmap, QStaticText, QTransform, QFontMetrics
 
-class LogGenerator(QThread):
-    new_log = pyqtSignal(str, str)  # (text, color: 'normal', 'error', 'success', 'progress')
-    module_change = pyqtSignal(str)
+import simulation_core
+from simulation_core import (
+    load_numpy, load_snippet_index, log_entry, format_time, parse_time, spawn_seeds,
+    Scheduler, LogCorpus, SessionLog, LogTemplate,
+    MODES, MAX_DURATION, RANDOM_BLOCK_SIZE, SESSION_LOG_COMPRESSIONS, LOG_COLORS, LOG_COLOR_BITS, LOG_COLOR_MASK
+)
+
+# 全局共用的样式表：只在第一次创建窗口时设置到QApplication上，
+# 之后再打开的执行窗口不需要再解析任何样式
+APP_STYLESHEET = '''
+QWidget {
+    background-color: #000000;
+}
+QLabel, QCheckBox {
+    color: #FFFFFF;
+}
+QLabel#modeLabel {
+    color: #FF4500;
+    padding: 10px;
+}
+QLabel#modeLabel[finished="true"] {
+    color: #00FF00;
+    background-color: #1E1E1E;
+}
+QLabel#statusLabel {
+    color: #CCCCCC;
+    padding: 5px;
+}
+QLabel#metricsOverlay {
+    color: #FFFF00;
+    background-color: rgba(0, 0, 0, 180);
+    border: 1px solid #333333;
+    font-family: Consolas, "Courier New";
+    font-size: 9pt;
+    padding: 4px;
+}
+LogView#codeText {
+    color: #00FF00;
+    font-family: Consolas, "Courier New";
+    font-size: 10pt;
+}
+QComboBox, QSpinBox {
+    background-color: #000000;
+    color: #FFFFFF;
+    border: 2px solid #333333;
+    border-radius: 5px;
+    padding: 5px;
+}
+QComboBox::drop-down {
+    border-left: 2px solid #333333;
+    background-color: #111111;
+}
+QComboBox QAbstractItemView {
+    background-color: #000000;
+    color: #FFFFFF;
+    border: 2px solid #333333;
+}
+QPushButton {
+    color: #FFFFFF;
+    border: 2px solid #333333;
+    border-radius: 5px;
+    padding: 5px;
+}
+QPushButton#startButton {
+    background-color: #4CAF50;
+    color: white;
+    padding: 10px;
+    border-radius: 5px;
+    border: none;
+}
+QPushButton#startButton:hover {
+    background-color: #45a049;
+}
+QPushButton#startButton:pressed {
+    background-color: #3d8b40;
+}
+'''
+
+def apply_theme():
+    app = QApplication.instance()
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
+
+# 执行窗口中可选的速度倍数
+SIMULATION_SPEEDS = {'1x': 1.0, '2x': 2.0, '5x': 5.0, '10x': 10.0}
+
+class SimulationScheduler(QThread):
+    # 在独立线程中运行核心调度器（见simulation_core.Scheduler），完成和控制状态变化转为Qt信号
     finished = pyqtSignal()
+    control_changed = pyqtSignal(bool, float)  # (paused, speed)
     
     def __init__(self, duration):
         super().__init__()
-        self.duration = duration  # seconds
-        self.running = True
-        self.start_time = None
+        self.scheduler = Scheduler(duration)
+        self.scheduler.finished.connect(self.finished.emit)
+        self.scheduler.control_changed.connect(self.control_changed.emit)
+        self.add_task = self.scheduler.add_task
+        self.remove_task = self.scheduler.remove_task
+        self.set_paused = self.scheduler.set_paused
+        self.set_speed = self.scheduler.set_speed
+    
+    @property
+    def paused(self):
+        return self.scheduler.paused
+    
+    @property
+    def speed(self):
+        return self.scheduler.speed
     
     def run(self):
-        self.start_time = time.time()
-        
-        # 预定义的代码和日志片段
-        code_snippets = {
-            'compilation': [
-                'gcc -O2 -c main.c',
-                'In file included from main.c:5:',
-                'header.h:12: warning: implicit declaration of function',
-                'Linking object files...',
-                'Creating executable: output.exe',
-                'ld: warning: -z relro reduced flexibility',
-                '[=====>                      ] 28% Compiling core modules...',
-                '[===========>                ] 45% Optimizing memory access...'
-            ],
-            'model_training': [
-                'Epoch 1/100',
-                '500/500 [==============================] - 15s 30ms/step - loss: 0.4523 - accuracy: 0.8234',
-                'Epoch 2/100',
-                '500/500 [==============================] - 14s 28ms/step - loss: 0.3215 - accuracy: 0.8765',
-                'Optimizer: Adam learning rate: 0.001',
-                'Layers: 4 Hidden units: 256, 128, 64, 32',
-                'Processing... █████░░░░░ 32% - Batch normalization applied',
-                'Checkpoint saved at epoch 5'
-            ],
-            'data_mining': [
-                'Loading dataset: 1,234,567 records',
-                'Extracting features from raw data...',
-                'Applying dimensionality reduction (PCA)...',
-                'Clustering with K-means: K=8',
-                'Calculating information entropy...',
-                'Correlation matrix computed: 0.879',
-                '[=================>          ] 65% - Pattern recognition in progress',
-                'Found 15 anomalies in the dataset'
-            ],
-            'system_optimization': [
-                'Scanning system files...',
-                'Defragmenting memory allocation tables',
-                'Optimizing kernel parameters...',
-                'Adjusting CPU scheduling priorities',
-                'Updating system cache policies',
-                'Benchmark results: 12754 IOPS',
-                'Performance improved by 15.3%',
-                '[============================> ] 92% - Finalizing system configurations'
-            ],
-            'model_initialization': [
-                'Importing TensorFlow/PyTorch modules',
-                'Defining model architecture...',
-                'Setting up loss functions and metrics',
-                'Configuring callbacks: EarlyStopping, ModelCheckpoint',
-                'Preparing dataset for training',
-                'Initializing weights with Xavier uniform distribution',
-                'Building computation graph...',
-                'Model summary: 2,567,890 parameters'
-            ],
-            'flux_model_repair': [
-                'Self-check protocol initiated',
-                'Scanning model components...',
-                'Error detected in attention mechanism',
-                'Initiating auto-repair sequence',
-                'Reconstructing model layers 3-7',
-                'Validating model integrity...',
-                'Repair progress: █████████░░ 75%',
-                'Attention mechanism restored successfully'
-            ],
-            'errors': [
-                'ERROR: Memory allocation failed in layer 4',
-                'WARNING: Training loss increased unexpectedly',
-                'CRITICAL: Connection timeout with data server',
-                'ERROR: CUDA out of memory. Trying to reduce batch size...',
-                'WARNING: NAN values detected in gradient',
-                'ERROR: File not found: weights.h5'
-            ],
-            'fixes': [
-                'Applying workaround: Memory fragmentation reduced',
-                'Solution: Adjusting learning rate scheduler',
-                'Retrying connection with backup server...',
-                'Successfully reduced batch size to 16',
-                'Gradient clipping applied to prevent NAN values',
-                'Loading weights from backup file: weights_bak.h5',
-                'Fix applied successfully!',
-                'System recovered from critical error'
-            ],
-            'progress': [
-                '[=                     ] 5%',
-                '[====                  ] 20%',
-                '[==========            ] 40%',
-                '[==============        ] 60%',
-                '[====================  ] 85%',
-                '[======================] 100%',
-                'Processing... ██░░░░░░░░░░░ 15%',
-                'Processing... ██████░░░░░░░ 35%',
-                'Processing... ██████████░░░ 65%',
-                'Processing... █████████████ 100%'
-            ]
-        }
-        
-        modules = [
-            'Neural Network Optimization',
-            'Data Preprocessing Pipeline',
-            'Feature Engineering',
-            'Hyperparameter Tuning',
-            'Cross-Validation',
-            'Model Ensemble',
-            'Performance Benchmarking',
-            'System Integration'
-        ]
-        
-        # 根据当前模式选择主要的日志类型
-        current_time = time.time()
-        while self.running and (current_time - self.start_time) < self.duration:
-            current_time = time.time()
-            
-            # 随机决定当前的行动
-            action = random.random()
-            
-            if action < 0.03:  # 3% 概率切换模块
-                module = random.choice(modules)
-                self.module_change.emit(module)
-                time.sleep(0.5)
-            elif action < 0.08:  # 5% 概率显示错误
-                error = random.choice(code_snippets['errors'])
-                self.new_log.emit(error, 'error')
-                # 通常错误后会有修复
-                time.sleep(random.uniform(0.5, 1.5))
-                fix = random.choice(code_snippets['fixes'])
-                self.new_log.emit(fix, 'success')
-            elif action < 0.15:  # 7% 概率显示进度
-                progress = random.choice(code_snippets['progress'])
-                self.new_log.emit(progress, 'progress')
-            else:  # 80% 概率显示正常日志
-                log_type = random.choice(['compilation', 'model_training', 'data_mining', 
-                                        'system_optimization', 'model_initialization', 'flux_model_repair'])
-                log = random.choice(code_snippets[log_type])
-                self.new_log.emit(log, 'normal')
-            
-            # 随机的滚动速度
-            sleep_time = random.choice([
-                0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 3.0
-            ])
-            time.sleep(sleep_time)
-            
-        self.finished.emit()
+        self.scheduler.run()
     
     def stop(self):
-        self.running = False
+        self.scheduler.stop()
         self.wait()
 
-class ProgressManager(QThread):
-    progress_update = pyqtSignal(int, int, int)  # (main_progress, secondary1_progress, secondary2_progress)
-    time_update = pyqtSignal(str, str)  # (elapsed_time, remaining_time)
+class EventLoopScheduler(QObject):
+    # 单线程调度引擎：在界面线程的Qt事件循环中驱动核心调度器，到期时由单次精确计时器执行任务步骤
+    # 不创建调度线程，任务发出的事件直接调用界面槽函数，不经过跨线程排队；接口与SimulationScheduler相同
     finished = pyqtSignal()
+    control_changed = pyqtSignal(bool, float)  # (paused, speed)
     
     def __init__(self, duration):
         super().__init__()
-        self.duration = duration  # seconds
-        self.running = True
-        self.start_time = None
-        # 随机生成其他两个进度条的目标时间（在0.5T到1.5T之间）
-        self.secondary1_time = duration * random.uniform(0.5, 1.5)
-        self.secondary2_time = duration * random.uniform(0.5, 1.5)
+        self.scheduler = Scheduler(duration)
+        self.scheduler.finished.connect(self.finished.emit)
+        self.scheduler.control_changed.connect(self.control_changed.emit)
+        # 暂停、继续和调速后按新的时钟重新计算下一次唤醒时间
+        self.scheduler.control_changed.connect(self.schedule)
+        self.add_task = self.scheduler.add_task
+        self.set_paused = self.scheduler.set_paused
+        self.set_speed = self.scheduler.set_speed
+        self.active = False
+        self.target = None  # 下一个任务到期的模拟时间
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
     
-    def run(self):
-        self.start_time = time.time()
-        
-        # 随机生成一些卡顿点
-        slowdown_points1 = sorted([random.uniform(0.1, 0.9) for _ in range(3)])
-        slowdown_points2 = sorted([random.uniform(0.1, 0.9) for _ in range(3)])
-        
-        current_time = time.time()
-        while self.running and (current_time - self.start_time) < self.duration:
-            current_time = time.time()
-            elapsed = current_time - self.start_time
-            
-            # 计算主进度（线性的）
-            main_progress = min(100, int((elapsed / self.duration) * 100))
-            
-            # 计算次要进度1（有卡顿效果）
-            secondary1_elapsed = elapsed
-            # 模拟卡顿效果
-            for point in slowdown_points1:
-                if main_progress > point * 100:
-                    slowdown_factor = random.uniform(0.1, 0.3)
-                    secondary1_elapsed += slowdown_factor * self.duration * 0.1
-            secondary1_progress = min(100, int((secondary1_elapsed / self.secondary1_time) * 100))
-            
-            # 计算次要进度2（有卡顿效果）
-            secondary2_elapsed = elapsed
-            for point in slowdown_points2:
-                if main_progress > point * 100:
-                    slowdown_factor = random.uniform(0.1, 0.3)
-                    secondary2_elapsed += slowdown_factor * self.duration * 0.1
-            secondary2_progress = min(100, int((secondary2_elapsed / self.secondary2_time) * 100))
-            
-            # 模拟卡在99%的效果
-            if main_progress == 99 and secondary1_progress == 99:
-                secondary1_progress = 99
-            elif main_progress == 99 and secondary2_progress == 99:
-                secondary2_progress = 99
-            
-            # 更新进度
-            self.progress_update.emit(main_progress, secondary1_progress, secondary2_progress)
-            
-            # 计算时间
-            elapsed_time = self.format_time(elapsed)
-            remaining = max(0, self.duration - elapsed)
-            remaining_time = self.format_time(remaining)
-            self.time_update.emit(elapsed_time, remaining_time)
-            
-            time.sleep(0.1)  # 更新频率
-            current_time = time.time()
-        
-        # 确保最终都到达100%
-        self.progress_update.emit(100, 100, 100)
-        elapsed = time.time() - self.start_time
-        elapsed_time = self.format_time(elapsed)
-        self.time_update.emit(elapsed_time, '00:00:00')
-        self.finished.emit()
-    
-    def format_time(self, seconds):
-        hours, remainder = divmod(int(seconds), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+    @property
+    def paused(self):
+        return self.scheduler.paused
+    
+    @property
+    def speed(self):
+        return self.scheduler.speed
+    
+    def isRunning(self):
+        return self.active
+    
+    def start(self):
+        self.active = True
+        self.scheduler.begin()
+        self.tick()
+    
+    def tick(self):
+        self.target = self.scheduler.advance()
+        if self.target is None:
+            self.active = False
+            self.scheduler.end()
+            return
+        self.schedule()
+    
+    def schedule(self, *args):
+        if not self.active:
+            return
+        timeout = self.scheduler.wait_time(self.target)
+        if timeout is None:
+            self.timer.stop()
+        else:
+            self.timer.start(math.ceil(timeout * 1000))
+    
+    def remove_task(self, task):
+        # 被移除的任务在下一轮调度时丢弃，全部移除后立即结束
+        self.scheduler.remove_task(task)
+        if self.active:
+            self.timer.start(0)
     
     def stop(self):
-        self.running = False
-        self.wait()
+        self.timer.stop()
+        self.scheduler.stop()
+        if self.active:
+            self.active = False
+            self.scheduler.end()
 
-class MainWindow(QMainWindow):
-    def __init__(self, mode, duration, show_time_in_progress, show_status_bar):
+# 调度引擎：独立的调度线程，或在界面线程的事件循环中运行
+SCHEDULER_ENGINES = {'thread': SimulationScheduler, 'eventloop': EventLoopScheduler}
+
+class LogGenerator(QObject):
+    # 核心日志生成器（见simulation_core.LogGenerator）的Qt包装：在调度线程中发出的事件跨线程排队投递到界面线程
+    # (entries, extra)：日志条目列表和附带的文本，格式见simulation_core.LOG_COLOR_BITS上方的说明；
+    # 跨线程只传递这两个对象的引用，界面线程按下标查共享日志表
+    new_logs = pyqtSignal(list, list)
+    module_change = pyqtSignal(str)
+    
+    def __init__(self, *args, **kwargs):
         super().__init__()
-        self.mode = mode
+        self.generator = simulation_core.LogGenerator(*args, **kwargs)
+        self.texts = self.generator.texts
+        self.generator.new_logs.connect(self.new_logs.emit)
+        self.generator.module_change.connect(self.module_change.emit)
+        self.steps = self.generator.steps
+        self.finish = self.generator.finish
+
+class ProgressManager(QObject):
+    # 核心进度管理（见simulation_core.ProgressManager）的Qt包装
+    progress_update = pyqtSignal(int, int, int)  # (main_progress, secondary1_progress, secondary2_progress)
+    time_update = pyqtSignal(str, str)  # (elapsed_time, remaining_time)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.manager = simulation_core.ProgressManager(*args, **kwargs)
+        self.manager.progress_update.connect(self.progress_update.emit)
+        self.manager.time_update.connect(self.time_update.emit)
+        self.steps = self.manager.steps
+        self.finish = self.manager.finish
+
+# 执行记录文件格式（二进制时间线）：
+#   文件头：TIMELINE_HEADER（魔数、版本、执行时长秒数、模式文字的字节数），随后是UTF-8编码的模式文字
+#   记录：varint 距上一条记录的模拟时间毫秒数 + 1字节记录类型 + 内容
+#     TIMELINE_STRING   varint 字节数 + UTF-8文本，定义下一个字符串ID（从0递增）
+#     TIMELINE_LOGS     varint 行数 + 每行 (varint 引用, 1字节颜色ID)，对应一批new_logs：
+#                       引用是字符串ID + 2；引用为0时随后是 varint 字节数 + UTF-8文本，
+#                       即只随这一批附带的文本（语料行等），不进入字符串表；
+#                       引用为1时是动态片段的渲染结果，随后是 varint 片段原文的字符串ID + 每个字段一个varint字段值
+#     TIMELINE_MODULE   varint 字符串ID
+#     TIMELINE_PROGRESS 3字节，三个进度条的百分比
+#     TIMELINE_TIME     varint 已运行秒数 + varint 剩余秒数
+TIMELINE_MAGIC = b'CGTL'
+TIMELINE_VERSION = 3
+TIMELINE_HEADER = struct.Struct('<4sHIH')
+TIMELINE_STRING, TIMELINE_LOGS, TIMELINE_MODULE, TIMELINE_PROGRESS, TIMELINE_TIME = range(5)
+TIMELINE_SUFFIX = '.cgtl'
+# 执行记录默认保存的目录（相对当前工作目录）
+RECORDINGS_DIR = 'recordings'
+# 会话日志默认保存的目录（相对当前工作目录）
+SESSION_LOGS_DIR = 'logs'
+SESSION_LOG_SUFFIX = '.log'
+# 回放速度选项 -> 倍数，0表示尽快回放
+REPLAY_SPEEDS = {'1x': 1.0, '2x': 2.0, '10x': 10.0, '最快': 0}
+# 记录缓冲区超过该大小时写入文件，此外每隔一段时间写入一次，执行被强制结束时最多丢失这段时间的记录
+TIMELINE_FLUSH_BYTES = 64 * 1024
+TIMELINE_FLUSH_INTERVAL = 1000  # ms
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def read_varint(data, position):
+    # 返回 (值, 下一个位置)；数据在值的中途结束时抛出IndexError
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+class TimelineRecorder(QObject):
+    # 把执行窗口收到的所有事件按模拟时间写成紧凑的二进制时间线，格式见TIMELINE_HEADER上方的说明
+    # clock是驱动本窗口的核心调度器：记录的间隔不受执行时的加速和暂停影响，按1x回放与原始执行时长相同
+    def __init__(self, path, duration, mode, texts, clock):
+        super().__init__()
+        self.texts = texts  # 日志来源的日志表
+        self.clock = clock
+        self.file = open(path, 'wb')
+        mode_bytes = mode.encode('utf-8')
+        self.file.write(TIMELINE_HEADER.pack(TIMELINE_MAGIC, TIMELINE_VERSION, int(duration), len(mode_bytes)))
+        self.file.write(mode_bytes)
+        self.buffer = bytearray()
+        # 字符串表只收录日志表中的文本和模块名，总数有上限；附带文本大多只出现一次，
+        # 动态片段只写片段原文的字符串ID和字段值，其他附带文本直接写在记录中
+        self.index = load_snippet_index()
+        self.strings = {}
+        self.table_string_ids = {}  # 日志表中的文本ID -> 字符串ID
+        # 按毫秒累计的上一条记录时间，避免舍入误差累积
+        self.last_time = 0.0
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(TIMELINE_FLUSH_INTERVAL)
+    
+    def string_id(self, text):
+        # 第一次出现的字符串先写一条定义记录，之后只引用ID
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+            data = text.encode('utf-8')
+            self.buffer += bytes((0, TIMELINE_STRING))
+            write_varint(self.buffer, len(data))
+            self.buffer += data
+        return string_id
+    
+    def write_record(self, kind, payload):
+        delta = max(0, int((self.clock.elapsed() - self.last_time) * 1000))
+        self.last_time += delta / 1000
+        write_varint(self.buffer, delta)
+        self.buffer.append(kind)
+        self.buffer += payload
+        if len(self.buffer) >= TIMELINE_FLUSH_BYTES:
+            self.flush()
+    
+    def table_string_id(self, text_id):
+        # 日志表中的文本按文本ID缓存字符串ID，重复出现时只需一次字典查找
+        string_id = self.table_string_ids.get(text_id)
+        if string_id is None:
+            string_id = self.table_string_ids[text_id] = self.string_id(self.texts[text_id])
+        return string_id
+    
+    def record_logs(self, entries, extra):
+        payload = bytearray()
+        write_varint(payload, len(entries))
+        for entry in entries:
+            text_id = entry >> LOG_COLOR_BITS
+            if text_id >= 0:
+                write_varint(payload, self.table_string_id(text_id) + 2)
+            else:
+                text = extra[~text_id]
+                template = self.index.match_template(text)
+                if template is not None:
+                    template_id, values = template
+                    payload.append(1)
+                    write_varint(payload, self.table_string_id(template_id))
+                    for value in values:
+                        write_varint(payload, value)
+                else:
+                    data = text.encode('utf-8')
+                    payload.append(0)
+                    write_varint(payload, len(data))
+                    payload += data
+            payload.append(entry & LOG_COLOR_MASK)
+        self.write_record(TIMELINE_LOGS, payload)
+    
+    def record_module(self, module_name):
+        payload = bytearray()
+        write_varint(payload, self.string_id(module_name))
+        self.write_record(TIMELINE_MODULE, payload)
+    
+    def record_progress(self, main_val, secondary1_val, secondary2_val):
+        self.write_record(TIMELINE_PROGRESS, bytes((main_val, secondary1_val, secondary2_val)))
+    
+    def record_time(self, elapsed, remaining):
+        payload = bytearray()
+        write_varint(payload, parse_time(elapsed))
+        write_varint(payload, parse_time(remaining))
+        self.write_record(TIMELINE_TIME, payload)
+    
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.buffer = bytearray()
+    
+    def close(self):
+        self.flush_timer.stop()
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+class TimelineReplay(QObject):
+    # 按记录的时间间隔重放执行记录，可作为SimulationScheduler的任务代替LogGenerator和ProgressManager
+    # speed为回放倍数，0表示不等待、尽快回放；同一个文件每次回放产生完全相同的事件序列
+    new_logs = pyqtSignal(list, list)
+    module_change = pyqtSignal(str)
+    progress_update = pyqtSignal(int, int, int)
+    time_update = pyqtSignal(str, str)
+    
+    def __init__(self, path, speed=1.0):
+        super().__init__()
+        # 记录文件很小（每小时约60KB），直接整体读入
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        if len(self.data) < TIMELINE_HEADER.size:
+            raise ValueError('不是有效的执行记录文件')
+        magic, version, duration, mode_length = TIMELINE_HEADER.unpack_from(self.data)
+        if magic != TIMELINE_MAGIC or version != TIMELINE_VERSION:
+            raise ValueError('不是有效的执行记录文件')
         self.duration = duration
+        self.mode = self.data[TIMELINE_HEADER.size:TIMELINE_HEADER.size + mode_length].decode('utf-8')
+        self.speed = speed
+        # 日志表：共享日志表之后依次追加记录中定义的字符串，完成日志等共享条目在回放时同样有效
+        self.texts = list(load_snippet_index().texts)
+        self.base = len(self.texts)  # 记录中的字符串ID 0 在日志表中的位置
+        self.templates = {}  # 字符串ID -> 编译好的动态片段，第一次用到时编译
+        self.events = self.read_events(TIMELINE_HEADER.size + mode_length)
+        self.pending_event = None
+    
+    def read_events(self, position):
+        # 逐条产出 (距上一条的秒数, 记录类型, 参数)，字符串定义记录在内部处理
+        # 执行被强制结束时文件末尾的记录可能不完整，回放到最后一条完整的记录为止
+        data = self.data
+        delay = 0
+        while position < len(data):
+            try:
+                delta, kind, args, position = self.read_record(data, position)
+            except IndexError:
+                return
+            delay += delta / 1000
+            if kind == TIMELINE_STRING:
+                self.texts.append(args)
+                continue
+            yield delay, kind, args
+            delay = 0
+    
+    def read_record(self, data, position):
+        # 解析一条完整的记录，返回 (毫秒数, 记录类型, 参数, 下一个位置)；记录不完整时抛出IndexError
+        base = self.base
+        delta, position = read_varint(data, position)
+        kind = data[position]
+        position += 1
+        if kind == TIMELINE_STRING:
+            text, position = self.read_text(data, position)
+            return delta, kind, text, position
+        if kind == TIMELINE_LOGS:
+            count, position = read_varint(data, position)
+            entries = []
+            extra = []
+            for _ in range(count):
+                reference, position = read_varint(data, position)
+                if reference >= 2:
+                    text_id = base + reference - 2
+                else:
+                    if reference:
+                        text, position = self.read_template(data, position)
+                    else:
+                        text, position = self.read_text(data, position)
+                    text_id = ~len(extra)
+                    extra.append(text)
+                entries.append(text_id << LOG_COLOR_BITS | data[position])
+                position += 1
+            args = (entries, extra)
+        elif kind == TIMELINE_MODULE:
+            string_id, position = read_varint(data, position)
+            args = (self.texts[base + string_id],)
+        elif kind == TIMELINE_PROGRESS:
+            if position + 3 > len(data):
+                raise IndexError(position)
+            args = tuple(data[position:position + 3])
+            position += 3
+        elif kind == TIMELINE_TIME:
+            elapsed, position = read_varint(data, position)
+            remaining, position = read_varint(data, position)
+            args = (format_time(elapsed), format_time(remaining))
+        else:
+            raise ValueError(f'未知的记录类型: {kind}')
+        return delta, kind, args, position
+    
+    def read_template(self, data, position):
+        # varint 片段原文的字符串ID + 字段值，按记录时相同的片段重新渲染，返回 (文本, 下一个位置)
+        string_id, position = read_varint(data, position)
+        template = self.templates.get(string_id)
+        if template is None:
+            template = self.templates[string_id] = LogTemplate(self.texts[self.base + string_id])
+        values = []
+        for _ in template.slots:
+            value, position = read_varint(data, position)
+            values.append(value)
+        return template.format(values), position
+    
+    def read_text(self, data, position):
+        # varint 字节数 + UTF-8文本，返回 (文本, 下一个位置)
+        length, position = read_varint(data, position)
+        if position + length > len(data):
+            raise IndexError(position)
+        return data[position:position + length].decode('utf-8'), position + length
+    
+    def dispatch(self, kind, args):
+        if kind == TIMELINE_LOGS:
+            self.new_logs.emit(*args)
+        elif kind == TIMELINE_MODULE:
+            self.module_change.emit(*args)
+        elif kind == TIMELINE_PROGRESS:
+            self.progress_update.emit(*args)
+        else:
+            self.time_update.emit(*args)
+    
+    def steps(self, clock):
+        for delay, kind, args in self.events:
+            # 先记下要发送的事件，被调度线程提前结束时由finish补发
+            self.pending_event = (kind, args)
+            yield delay / self.speed if self.speed else 0
+            self.pending_event = None
+            self.dispatch(kind, args)
+    
+    def finish(self, clock):
+        # 执行时间到达时把剩余的事件立即发完，保证回放结果与记录一致
+        if self.pending_event is not None:
+            self.dispatch(*self.pending_event)
+            self.pending_event = None
+        for _, kind, args in self.events:
+            self.dispatch(kind, args)
+
+# 热点路径性能监控（默认关闭，关闭时不包装任何槽函数、不启动任何计时器）
+# 直方图桶的上界（毫秒），按对数间隔划分，最后一个桶收集所有更大的值
+METRICS_BUCKETS_MS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float('inf'))
+METRICS_PROBE_INTERVAL = 50  # ms，事件循环卡顿探测间隔
+METRICS_REPORT_INTERVAL = 1000  # ms，刷新叠加显示和写入指标文件的间隔
+
+# 被监控的信号 -> 接收它的界面槽函数
+INSTRUMENTED_SIGNALS = (
+    ('new_logs', 'append_logs'),
+    ('module_change', 'change_module'),
+    ('progress_update', 'update_progress'),
+    ('time_update', 'update_time'),
+)
+
+class Histogram:
+    # 固定桶的直方图，记录一次只是一次二分查找和计数，内存不随样本数增长
+    def __init__(self):
+        self.counts = [0] * len(METRICS_BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, value):
+        self.counts[bisect.bisect_left(METRICS_BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def percentile(self, fraction):
+        # 返回所在桶的上界；落在最后一个桶时用最大值代替无穷大
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(METRICS_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+    
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.50),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+class HotPathMetrics(QObject):
+    # 一个执行窗口的热点路径指标：各界面槽函数的耗时、排队信号从发送到槽函数执行的延迟、
+    # 事件循环卡顿时间，定期显示在叠加标签上并按行追加写入JSON指标文件
+    def __init__(self, overlay=None, path=None, name=''):
+        super().__init__()
+        self.overlay = overlay
+        self.name = name
+        self.file = open(path, 'a', encoding='utf-8') if path else None
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.perf_counter()
+        self.last_probe = None
+        
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setInterval(METRICS_PROBE_INTERVAL)
+        self.probe_timer.timeout.connect(self.probe)
+        self.report_timer = QTimer(self)
+        self.report_timer.setInterval(METRICS_REPORT_INTERVAL)
+        self.report_timer.timeout.connect(self.report)
+    
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+    
+    def instrument(self, source, signal_name, slot, slot_name):
+        # 返回包装后的槽函数，调用方用它代替原槽函数连接信号
+        # 发送时间由一个直接连接在发送线程里记下；同一信号的排队投递保持顺序，按先进先出配对
+        stamps = deque()
+        getattr(source, signal_name).connect(lambda *args: stamps.append(time.perf_counter()), Qt.DirectConnection)
+        duration = self.histogram(slot_name)
+        latency = self.histogram(signal_name + '.latency')
+        counters = self.counters
+        counters[slot_name] = 0
+        
+        def timed_slot(*args):
+            start = time.perf_counter()
+            if stamps:
+                latency.record((start - stamps.popleft()) * 1000)
+            slot(*args)
+            duration.record((time.perf_counter() - start) * 1000)
+            counters[slot_name] += 1
+        return timed_slot
+    
+    def start(self):
+        self.last_probe = time.perf_counter()
+        self.probe_timer.start()
+        self.report_timer.start()
+    
+    def probe(self):
+        # 计时器实际触发时间比预期晚的部分就是事件循环被占用的时间
+        now = time.perf_counter()
+        self.histogram('event_loop_stall').record(max(0.0, (now - self.last_probe) * 1000 - METRICS_PROBE_INTERVAL))
+        self.last_probe = now
+    
+    def snapshot(self):
+        return {
+            'window': self.name,
+            'time': time.time(),
+            'uptime': time.perf_counter() - self.started,
+            'counters': dict(self.counters),
+            'histograms_ms': {name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+    
+    def report(self):
+        snapshot = self.snapshot()
+        if self.file is not None:
+            self.file.write(json.dumps(snapshot, ensure_ascii=False) + '\n')
+            self.file.flush()
+        if self.overlay is not None:
+            lines = []
+            for name, summary in snapshot['histograms_ms'].items():
+                lines.append(f"{name:<24} n={summary['count']:<7} p50={summary['p50']:.2f} p99={summary['p99']:.2f} max={summary['max']:.1f}")
+            self.overlay.setText('\n'.join(lines))
+            self.overlay.adjustSize()
+            parent = self.overlay.parentWidget()
+            self.overlay.move(parent.width() - self.overlay.width() - 20, 8)
+            self.overlay.raise_()
+    
+    def stop(self):
+        if self.probe_timer.isActive():
+            self.probe_timer.stop()
+            self.report_timer.stop()
+            # 关闭时再写一次最终结果
+            self.report()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+# 日志区域默认保留的最大行数（环形缓冲，超出后丢弃最早的行）
+DEFAULT_MAX_LOG_LINES = 5000
+# 排版结果缓存的最大条目数，日志片段是固定的小集合，正常情况下远达不到
+LOG_TEXT_CACHE_SIZE = 4096
+LOG_VIEW_MARGIN = 4  # pixels
+# 渲染节拍：追加日志只写入缓冲区，滚动和重绘最多每帧一次
+LOG_FRAME_INTERVAL = 16  # ms，约60Hz
+# 平滑滚动时每帧向末尾靠近剩余距离的比例
+LOG_SCROLL_EASING = 0.35
+
+# 日志颜色类型 -> (颜色, 是否加粗)
+LOG_STYLES = {
+    'normal': ('#00FF00', False),
+    'error': ('#FF0000', False),
+    'success': ('#00FF00', False),
+    'progress': ('#FFFF00', False),
+    'module': ('#00FFFF', True),
+}
+
+class LogView(QAbstractScrollArea):
+    # 日志显示控件：固定容量的环形缓冲区，只绘制可见的行
+    # 每种 (文本, 样式) 只排版一次并缓存为QStaticText，重复出现的行直接绘制
+    # 追加与显示解耦：日志随时写入缓冲区，由渲染节拍每帧更新一次滚动范围，平滑滚动到末尾并重绘
+    def __init__(self, max_lines=DEFAULT_MAX_LOG_LINES):
+        super().__init__()
+        self.max_lines = max_lines
+        self.lines = [None] * max_lines  # (QStaticText, style)；附带文本的行在排版前是 (text, style)
+        self.first = 0  # 最早一行在环形缓冲区中的位置
+        self.count = 0
+        self.dropped = 0  # 上一帧之后被覆盖的最早行数
+        self.position = 0.0  # 当前显示的第一行（可以是小数，平滑滚动中）
+        self.following = True  # 滚动条在末尾时跟随新日志
+        self.scrolling = False  # 由渲染节拍自己调整滚动条时为True
+        self.static_texts = {}
+        self.entry_lines = {}  # 日志表条目 -> 排版好的行 ((QStaticText, style), ...)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.setInterval(LOG_FRAME_INTERVAL)
+        self.frame_timer.timeout.connect(self.render_frame)
+        self.update_styles()
+    
+    def update_styles(self):
+        # 每种样式的画笔和字体只创建一次，字体变化（如样式表生效）时重建
+        font = self.font()
+        bold_font = QFont(font)
+        bold_font.setBold(True)
+        self.fonts = {}
+        self.pens = {}
+        for style, (color, bold) in LOG_STYLES.items():
+            self.fonts[style] = bold_font if bold else font
+            self.pens[style] = QPen(QColor(color))
+        self.line_height = max(QFontMetrics(font).lineSpacing(), QFontMetrics(bold_font).lineSpacing())
+        self.static_texts.clear()
+        self.entry_lines.clear()
+        self.render_frame()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self.update_styles()
+    
+    def static_text(self, text, style):
+        key = (text, style)
+        static = self.static_texts.get(key)
+        if static is None:
+            if len(self.static_texts) >= LOG_TEXT_CACHE_SIZE:
+                self.static_texts.clear()
+            static = QStaticText(text)
+            static.setTextFormat(Qt.PlainText)
+            static.prepare(QTransform(), self.fonts[style])
+            self.static_texts[key] = static
+        return static
+    
+    def line_count(self):
+        return self.count
+    
+    def append_lines(self, lines):
+        # lines: [(text, style), ...]，每项是不含换行的一行
+        prepared = []
+        for text, style in lines:
+            if style not in self.pens:
+                style = 'normal'
+            prepared.append((self.static_text(text, style), style))
+        self.push_lines(prepared)
+    
+    def append_entries(self, entries, extra, texts):
+        # 一批日志条目（格式见simulation_core.LOG_COLOR_BITS上方的说明），texts是发送方的日志表
+        # 日志表中的条目按整数缓存排版好的行，重复出现时只需一次字典查找；含换行的文本拆成多行
+        # 附带文本（语料、动态片段）大多只出现一次，先以文本放入缓冲区，真正显示时才排版，
+        # 日志涌入时被直接滚过的行不需要排版
+        lines = []
+        entry_lines = self.entry_lines
+        for entry in entries:
+            cached = entry_lines.get(entry)
+            if cached is None:
+                text_id = entry >> LOG_COLOR_BITS
+                style = LOG_COLORS[entry & LOG_COLOR_MASK]
+                if text_id < 0:
+                    lines.extend((line, style) for line in extra[~text_id].split('\n'))
+                    continue
+                cached = tuple((self.static_text(line, style), style) for line in texts[text_id].split('\n'))
+                if len(entry_lines) >= LOG_TEXT_CACHE_SIZE:
+                    entry_lines.clear()
+                entry_lines[entry] = cached
+            lines.extend(cached)
+        self.push_lines(lines)
+    
+    def push_lines(self, lines):
+        # lines: [(QStaticText, style), ...]；只写入缓冲区，显示由下一帧完成
+        dropped = 0
+        for line in lines:
+            if self.count < self.max_lines:
+                self.lines[(self.first + self.count) % self.max_lines] = line
+                self.count += 1
+            else:
+                # 缓冲区已满，覆盖最早的一行
+                self.lines[self.first] = line
+                self.first = (self.first + 1) % self.max_lines
+                dropped += 1
+        self.dropped += dropped
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+    
+    def render_frame(self):
+        # 每帧一次：更新滚动范围，跟随时把滚动条移到末尾，显示位置按比例靠近目标，到达后停止节拍
+        scrollbar = self.verticalScrollBar()
+        dropped, self.dropped = self.dropped, 0
+        self.position = max(0.0, self.position - dropped)
+        self.scrolling = True
+        self.update_scroll_range()
+        if self.following:
+            scrollbar.setValue(scrollbar.maximum())
+        elif dropped:
+            scrollbar.setValue(scrollbar.value() - dropped)
+        self.scrolling = False
+        
+        target = scrollbar.value()
+        distance = target - self.position
+        if distance > 1 / self.line_height:
+            # 一次到来大量日志时最多从一屏之外滚入
+            self.position = max(self.position + distance * LOG_SCROLL_EASING, target - self.visible_lines())
+        else:
+            self.position = float(target)
+            self.frame_timer.stop()
+        self.viewport().update()
+    
+    def visible_lines(self):
+        return max(1, (self.viewport().height() - 2 * LOG_VIEW_MARGIN) // self.line_height)
+    
+    def update_scroll_range(self):
+        scrollbar = self.verticalScrollBar()
+        visible = self.visible_lines()
+        scrollbar.setRange(0, max(0, self.count - visible))
+        scrollbar.setPageStep(visible)
+    
+    def resizeEvent(self, event):
+        scrollbar = self.verticalScrollBar()
+        super().resizeEvent(event)
+        self.scrolling = True
+        self.update_scroll_range()
+        if self.following:
+            scrollbar.setValue(scrollbar.maximum())
+        self.scrolling = False
+        self.position = float(scrollbar.value())
+    
+    def scrollContentsBy(self, dx, dy):
+        # 用户拖动或滚轮滚动时立即跳到该位置，回到末尾后重新跟随
+        if not self.scrolling:
+            scrollbar = self.verticalScrollBar()
+            self.position = float(scrollbar.value())
+            self.following = scrollbar.value() >= scrollbar.maximum()
+        self.viewport().update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        top = int(self.position)
+        end = min(self.count, top + self.visible_lines() + 2)
+        y = LOG_VIEW_MARGIN - (self.position - top) * self.line_height
+        current_style = None
+        for index in range(top, end):
+            slot = (self.first + index) % self.max_lines
+            static, style = self.lines[slot]
+            if type(static) is str:
+                static = self.static_text(static, style)
+                self.lines[slot] = (static, style)
+            if style != current_style:
+                current_style = style
+                painter.setFont(self.fonts[style])
+                painter.setPen(self.pens[style])
+            painter.drawStaticText(QPointF(LOG_VIEW_MARGIN, y), static)
+            y += self.line_height
+
+# 进度条外观，与原先样式表中QProgressBar的规则一致
+PROGRESS_BAR_BORDER = 2  # pixels
+PROGRESS_BAR_RADIUS = 5  # pixels
+PROGRESS_CHUNK_RADIUS = 3  # pixels
+PROGRESS_BAR_PADDING = 2  # pixels，文字上下留出的空白
+PROGRESS_BAR_FRAME_COLOR = '#333333'
+# 与窗口背景相同：圆角外的部分也由进度条自己画，重绘时不需要父控件先擦除背景
+PROGRESS_BAR_BACKGROUND = '#000000'
+PROGRESS_BAR_TEXT_COLOR = '#FFFFFF'
+# 主进度条和两个次要进度条的填充颜色
+PROGRESS_CHUNK_COLORS = ('#00FF00', '#0099FF', '#FF00FF')
+# 边框和填充图片的缓存组数，同尺寸同颜色的进度条共用一组
+PROGRESS_PIXMAP_CACHE_SIZE = 64
+
+class ProgressBar(QWidget):
+    # 轻量进度条：不经过样式表绘制，边框和填充各预先画成一张图片，同尺寸同颜色的进度条共用；
+    # 数值变化时只重绘新旧填充末端之间的区域和文字区域，百分比文字每个数值只排版一次。
+    # 一个窗口中放很多个（如每个模块一个）时，每次更新的绘制开销也只与变化的区域有关
+    pixmaps = {}  # (宽, 高, 设备像素比, 颜色) -> (边框图片, 填充图片)
+    static_texts = {}  # (数值, 字体) -> QStaticText
+    
+    def __init__(self, chunk_color=PROGRESS_CHUNK_COLORS[0], parent=None):
+        super().__init__(parent)
+        self.chunk_color = chunk_color
+        self.current = 0
+        self.fill = 0  # 当前填充的宽度（像素）
+        self.pixmap_key = None
+        self.text_pen = QPen(QColor(PROGRESS_BAR_TEXT_COLOR))
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.update_layout()
+    
+    def value(self):
+        return self.current
+    
+    def setValue(self, value):
+        value = min(100, max(0, value))
+        if value == self.current:
+            return
+        self.current = value
+        fill = self.chunk_width * value // 100
+        if fill != self.fill:
+            # 填充末端是圆角，两端各多重绘一个圆角半径
+            left = PROGRESS_BAR_BORDER + min(fill, self.fill) - PROGRESS_CHUNK_RADIUS
+            self.update(left, 0, abs(fill - self.fill) + 2 * PROGRESS_CHUNK_RADIUS, self.height())
+            self.fill = fill
+        self.update(self.text_rect)
+    
+    def sizeHint(self):
+        metrics = self.fontMetrics()
+        return QSize(metrics.horizontalAdvance('100%') * 4,
+                     metrics.height() + 2 * (PROGRESS_BAR_BORDER + PROGRESS_BAR_PADDING))
+    
+    def minimumSizeHint(self):
+        return QSize(4 * PROGRESS_BAR_RADIUS, self.sizeHint().height())
+    
+    def update_layout(self):
+        # 尺寸或字体变化时重新计算填充区域和文字区域；文字区域按最宽的“100%”居中，数值变化时只重绘这一块
+        self.chunk_width = max(0, self.width() - 2 * PROGRESS_BAR_BORDER)
+        self.chunk_height = max(0, self.height() - 2 * PROGRESS_BAR_BORDER)
+        self.fill = self.chunk_width * self.current // 100
+        metrics = self.fontMetrics()
+        width = metrics.horizontalAdvance('100%')
+        height = metrics.height()
+        self.text_rect = QRect((self.width() - width) // 2, (self.height() - height) // 2, width, height)
+        self.font_key = self.font().key()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self.update_layout()
+            self.updateGeometry()
+            self.update()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_layout()
+    
+    def ensure_pixmaps(self):
+        # 尺寸、屏幕缩放或颜色变化后换一组图片，已有的直接共用
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio, self.chunk_color)
+        if key == self.pixmap_key:
+            return
+        self.pixmap_key = key
+        pixmaps = ProgressBar.pixmaps.get(key)
+        if pixmaps is None:
+            if len(ProgressBar.pixmaps) >= PROGRESS_PIXMAP_CACHE_SIZE:
+                ProgressBar.pixmaps.clear()
+            pixmaps = ProgressBar.pixmaps[key] = self.draw_pixmaps(ratio)
+        self.frame_pixmap, self.chunk_pixmap = pixmaps
+        self.ratio = ratio
+    
+    def draw_pixmaps(self, ratio):
+        width, height = self.width(), self.height()
+        border = PROGRESS_BAR_BORDER
+        frame = QPixmap(max(1, round(width * ratio)), max(1, round(height * ratio)))
+        frame.setDevicePixelRatio(ratio)
+        frame.fill(QColor(PROGRESS_BAR_BACKGROUND))
+        painter = QPainter(frame)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(PROGRESS_BAR_FRAME_COLOR))
+        painter.drawRoundedRect(QRectF(0, 0, width, height), PROGRESS_BAR_RADIUS, PROGRESS_BAR_RADIUS)
+        painter.setBrush(QColor(PROGRESS_BAR_BACKGROUND))
+        painter.drawRoundedRect(QRectF(border, border, width - 2 * border, height - 2 * border),
+                                PROGRESS_CHUNK_RADIUS, PROGRESS_CHUNK_RADIUS)
+        painter.end()
+        
+        # 填充图片是满格时的圆角矩形，绘制时左边取主体、末端接上最右边的圆角
+        chunk_width = max(1, width - 2 * border)
+        chunk_height = max(1, height - 2 * border)
+        chunk = QPixmap(max(1, round(chunk_width * ratio)), max(1, round(chunk_height * ratio)))
+        chunk.setDevicePixelRatio(ratio)
+        chunk.fill(Qt.transparent)
+        painter = QPainter(chunk)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(self.chunk_color))
+        painter.drawRoundedRect(QRectF(0, 0, chunk_width, chunk_height), PROGRESS_CHUNK_RADIUS, PROGRESS_CHUNK_RADIUS)
+        painter.end()
+        return frame, chunk
+    
+    def static_text(self):
+        key = (self.current, self.font_key)
+        static = ProgressBar.static_texts.get(key)
+        if static is None:
+            if len(ProgressBar.static_texts) >= LOG_TEXT_CACHE_SIZE:
+                ProgressBar.static_texts.clear()
+            static = QStaticText(f'{self.current}%')
+            static.setTextFormat(Qt.PlainText)
+            static.prepare(QTransform(), self.font())
+            ProgressBar.static_texts[key] = static
+        return static
+    
+    def paintEvent(self, event):
+        # 绘制已被裁剪到需要重绘的区域，整张图片贴上去也只复制这一部分
+        self.ensure_pixmaps()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.frame_pixmap)
+        fill = self.fill
+        if fill:
+            border = PROGRESS_BAR_BORDER
+            chunk = self.chunk_pixmap
+            ratio = self.ratio
+            height = chunk.height()
+            cap = min(fill, PROGRESS_CHUNK_RADIUS)
+            body = fill - cap
+            # 源区域以图片像素为单位，按设备像素比换算
+            if body:
+                painter.drawPixmap(border, border, chunk, 0, 0, round(body * ratio), height)
+            cap_width = round(cap * ratio)
+            painter.drawPixmap(border + body, border, chunk, chunk.width() - cap_width, 0, cap_width, height)
+        if event.rect().intersects(self.text_rect):
+            static = self.static_text()
+            size = static.size()
+            painter.setFont(self.font())
+            painter.setPen(self.text_pen)
+            painter.drawStaticText(QPointF((self.width() - size.width()) / 2, (self.height() - size.height()) / 2), static)
+
+# 进度条标签随机切换时的候选文字
+PROGRESS_LABELS = ('编译进度', '模型收敛度', '数据加载', '内存分配', '校验和计算')
+
+class MainWindow(QMainWindow):
+    closed = pyqtSignal()
+    
+    def __init__(self, mode, duration, show_time_in_progress, show_status_bar,
+                 max_log_lines=DEFAULT_MAX_LOG_LINES, autostart=True, scheduler=None,
+                 corpus=None, corpus_replay=False, record_path=None, replay=None,
+                 instrument=False, metrics_path=None, name='', seed=None, engine='thread',
+                 session_log_path=None, session_log_compression='gzip'):
+        super().__init__()
         self.show_time_in_progress = show_time_in_progress
         self.show_status_bar = show_status_bar
+        self.max_log_lines = max_log_lines
+        self.engine = engine
+        self.corpus = corpus
+        self.corpus_replay = corpus_replay
+        self.record_path = record_path
+        self.replay = replay
+        self.recorder = None
+        self.session_log_path = session_log_path
+        self.session_log_compression = session_log_compression
+        self.session_log = None
+        # 日志来源的日志表，new_logs中的文本ID在这里查找；回放时换成记录文件的日志表
+        self.texts = load_snippet_index().texts
+        self.instrument = instrument
+        self.metrics_path = metrics_path
+        self.name = name
+        self.metrics = None
+        self.is_closed = False
+        apply_theme()
+        self.configure(mode, duration, seed)
+        self.init_ui()
+        # autostart=False 时只构建界面，由调用方自行驱动（如性能测试、常驻启动器预先构建的窗口）
+        if autostart:
+            self.start_simulation(scheduler)
+    
+    def configure(self, mode, duration, seed=None):
+        # 设置模式、时长和种子；预先构建好的窗口在start_simulation之前调用，重新设置标题和时间显示
+        self.mode = mode
+        self.mode_key = MODES.get(mode)
+        # 记录文件里保存的是配置窗口中的原始模式文字
+        self.requested_mode = mode
+        self.duration = duration
+        # 日志生成、进度轨迹和标签切换各用一个由本窗口种子派生的生成器
+        self.generator_seed, self.progress_seed, label_seed = spawn_seeds(seed, 3)
+        self.rng = load_numpy().random.default_rng(label_seed)
+        self.label_draws = []
         self.elapsed_time = '00:00:00'
-        self.remaining_time = self.format_time(duration)
+        self.remaining_time = format_time(duration)
         self.expected_completion = ''
         
         # 如果模式包含时间占位符，替换为预计完成时间
+        # 标题拆成占位符前后两段、本地时区偏移只在完成时刻跨过整点时重新读取，每秒刷新时只需整数运算和一次拼接
+        self.mode_parts = None
+        self.utc_offset = 0
+        self.offset_hour = None  # 上次读取时区偏移时完成时刻所在的小时
         if '预计XX:XX:XX完成' in mode:
-            completion_time = time.time() + duration
-            self.expected_completion = time.strftime('%H:%M:%S', time.localtime(completion_time))
-            self.mode = mode.replace('XX:XX:XX', self.expected_completion)
+            self.mode_parts = mode.split('XX:XX:XX', 1)
+            self.expected_completion = self.completion_time(duration)
+            self.mode = self.expected_completion.join(self.mode_parts)
         
-        self.init_ui()
-        self.start_simulation()
+        # 界面已经构建时同步更新显示
+        if hasattr(self, 'mode_label'):
+            self.mode_label.setText(self.mode)
+            if self.show_time_in_progress:
+                self.main_progress_time.setText(f'剩余: {self.remaining_time}')
+            if self.show_status_bar:
+                self.status_label.setText(f'已运行: {self.elapsed_time} / 剩余: {self.remaining_time} / 预计完成: {self.expected_completion}')
     
     def init_ui(self):
         # 设置窗口属性 - 添加最大化最小化按钮
@@ -275,106 +1084,55 @@ class MainWindow(QMainWindow):
         self.setWindowTitle('陈狗模型检测代码执行器')
         self.setGeometry(300, 300, 800, 600)
         
-        # 设置黑色主题
-        self.setStyleSheet('background-color: #000000;')
-        
         # 主布局
         central_widget = QWidget()
-        central_widget.setStyleSheet('background-color: #000000;')
         main_layout = QVBoxLayout(central_widget)
         self.setCentralWidget(central_widget)
         
         # 模式标题
         self.mode_label = QLabel(self.mode)
+        self.mode_label.setObjectName('modeLabel')
         self.mode_label.setFont(QFont('SimHei', 16, QFont.Bold))
-        self.mode_label.setStyleSheet('color: #FF4500; background-color: #000000; padding: 10px;')
         self.mode_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(self.mode_label)
         
-        # 代码显示区域
-        self.code_text = QTextEdit()
-        self.code_text.setReadOnly(True)
-        self.code_text.setStyleSheet('background-color: #000000; color: #00FF00; font-family: Consolas, Courier New; font-size: 10pt;')
+        # 代码显示区域 - 限制最大行数的环形缓冲，长时间运行时内存和追加开销保持恒定
+        self.code_text = LogView(self.max_log_lines)
+        self.code_text.setObjectName('codeText')
         main_layout.addWidget(self.code_text)
         
+        # 性能监控叠加显示（浮在日志区域右上角）
+        if self.instrument:
+            self.metrics_overlay = QLabel(self.code_text)
+            self.metrics_overlay.setObjectName('metricsOverlay')
+            self.metrics_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        
         # 进度条区域
         progress_layout = QVBoxLayout()
         progress_layout.setContentsMargins(10, 10, 10, 10)
         
         # 进度条1（主进度条）
-        self.main_progress = QProgressBar()
-        self.main_progress.setRange(0, 100)
-        self.main_progress.setValue(0)
-        # 设置进度条样式 - 黑色背景下更明显
-        self.main_progress.setStyleSheet(
-            "QProgressBar { " 
-            "    border: 2px solid #333333; " 
-            "    border-radius: 5px; " 
-            "    background-color: #000000; " 
-            "    text-align: center; " 
-            "    color: #FFFFFF; " 
-            " } " 
-            "QProgressBar::chunk { " 
-            "    background-color: #00FF00; " 
-            "    border-radius: 3px; " 
-            " }"
-        )
+        self.main_progress = ProgressBar(PROGRESS_CHUNK_COLORS[0])
         self.main_progress_label = QLabel('模型训练进度')
-        self.main_progress_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         self.main_progress_layout = QHBoxLayout()
         self.main_progress_layout.addWidget(self.main_progress_label, 1)
         if self.show_time_in_progress:
             self.main_progress_time = QLabel(f'剩余: {self.remaining_time}')
-            self.main_progress_time.setStyleSheet('color: #FFFFFF; background-color: #000000;')
             self.main_progress_layout.addWidget(self.main_progress_time)
         self.main_progress_layout.addWidget(self.main_progress, 3)
         progress_layout.addLayout(self.main_progress_layout)
         
         # 进度条2
-        self.secondary1_progress = QProgressBar()
-        self.secondary1_progress.setRange(0, 100)
-        self.secondary1_progress.setValue(0)
-        # 设置进度条样式
-        self.secondary1_progress.setStyleSheet(
-            "QProgressBar { " 
-            "    border: 2px solid #333333; " 
-            "    border-radius: 5px; " 
-            "    background-color: #000000; " 
-            "    text-align: center; " 
-            "    color: #FFFFFF; " 
-            " } " 
-            "QProgressBar::chunk { " 
-            "    background-color: #0099FF; " 
-            "    border-radius: 3px; " 
-            " }"
-        )
+        self.secondary1_progress = ProgressBar(PROGRESS_CHUNK_COLORS[1])
         self.secondary1_label = QLabel('数据加载进度')
-        self.secondary1_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         self.secondary1_layout = QHBoxLayout()
         self.secondary1_layout.addWidget(self.secondary1_label, 1)
         self.secondary1_layout.addWidget(self.secondary1_progress, 3)
         progress_layout.addLayout(self.secondary1_layout)
         
         # 进度条3
-        self.secondary2_progress = QProgressBar()
-        self.secondary2_progress.setRange(0, 100)
-        self.secondary2_progress.setValue(0)
-        # 设置进度条样式
-        self.secondary2_progress.setStyleSheet(
-            "QProgressBar { " 
-            "    border: 2px solid #333333; " 
-            "    border-radius: 5px; " 
-            "    background-color: #000000; " 
-            "    text-align: center; " 
-            "    color: #FFFFFF; " 
-            " } " 
-            "QProgressBar::chunk { " 
-            "    background-color: #FF00FF; " 
-            "    border-radius: 3px; " 
-            " }"
-        )
+        self.secondary2_progress = ProgressBar(PROGRESS_CHUNK_COLORS[2])
         self.secondary2_label = QLabel('内存分配进度')
-        self.secondary2_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         self.secondary2_layout = QHBoxLayout()
         self.secondary2_layout.addWidget(self.secondary2_label, 1)
         self.secondary2_layout.addWidget(self.secondary2_progress, 3)
@@ -382,75 +1140,120 @@ class MainWindow(QMainWindow):
         
         main_layout.addLayout(progress_layout)
         
+        # 运行控制：暂停/继续和速度倍数（多窗口会话中作用于共用的调度线程）
+        control_layout = QHBoxLayout()
+        control_layout.setContentsMargins(10, 0, 10, 0)
+        self.pause_button = QPushButton('暂停')
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems(list(SIMULATION_SPEEDS))
+        control_layout.addWidget(self.pause_button)
+        control_layout.addWidget(self.speed_combo)
+        control_layout.addStretch(1)
+        main_layout.addLayout(control_layout)
+        
         # 状态栏
         if self.show_status_bar:
             self.status_label = QLabel(f'已运行: {self.elapsed_time} / 剩余: {self.remaining_time} / 预计完成: {self.expected_completion}')
-            self.status_label.setStyleSheet('background-color: #000000; color: #CCCCCC; padding: 5px;')
+            self.status_label.setObjectName('statusLabel')
             main_layout.addWidget(self.status_label)
     
-    def start_simulation(self):
-        # 启动日志生成线程
-        self.log_generator = LogGenerator(self.duration)
-        self.log_generator.new_log.connect(self.append_log)
-        self.log_generator.module_change.connect(self.change_module)
-        self.log_generator.finished.connect(self.simulation_finished)
-        self.log_generator.start()
-        
-        # 启动进度管理线程
-        self.progress_manager = ProgressManager(self.duration)
-        self.progress_manager.progress_update.connect(self.update_progress)
-        self.progress_manager.time_update.connect(self.update_time)
-        self.progress_manager.finished.connect(self.simulation_finished)
-        self.progress_manager.start()
-    
-    def append_log(self, text, color_type):
-        # 设置文本颜色
-        format = QTextCharFormat()
-        if color_type == 'error':
-            format.setForeground(QColor('#FF0000'))
-        elif color_type == 'success':
-            format.setForeground(QColor('#00FF00'))
-        elif color_type == 'progress':
-            format.setForeground(QColor('#FFFF00'))
+    def start_simulation(self, scheduler=None):
+        # 日志生成和进度更新由同一个调度线程按同一时钟驱动
+        # 传入scheduler时加入共享的调度线程（多窗口会话），由会话负责启动和停止
+        if self.replay is not None:
+            # 回放执行记录时由同一个对象提供日志和进度
+            self.tasks = [self.replay]
+            log_source = progress_source = self.replay
+            self.texts = self.replay.texts
+        else:
+            # 日志中的动态片段按进度轨迹取值，进度管理先创建
+            self.progress_manager = ProgressManager(self.duration, self.progress_seed)
+            self.log_generator = LogGenerator(self.duration, self.mode_key, self.generator_seed,
+                                              corpus=self.corpus, corpus_replay=self.corpus_replay,
+                                              progress=self.progress_manager.manager)
+            self.tasks = [self.log_generator, self.progress_manager]
+            log_source, progress_source = self.tasks
+        # 开启性能监控时连接包装过的槽函数，未开启时直接连接原槽函数，没有任何额外开销
+        if self.instrument:
+            self.metrics = HotPathMetrics(self.metrics_overlay, self.metrics_path, self.name)
+            sources = {'new_logs': log_source, 'module_change': log_source,
+                       'progress_update': progress_source, 'time_update': progress_source}
+            for signal_name, slot_name in INSTRUMENTED_SIGNALS:
+                source = sources[signal_name]
+                slot = self.metrics.instrument(source, signal_name, getattr(self, slot_name), slot_name)
+                getattr(source, signal_name).connect(slot)
+            self.metrics.start()
         else:
-            format.setForeground(QColor('#00FF00'))
+            log_source.new_logs.connect(self.append_logs)
+            log_source.module_change.connect(self.change_module)
+            progress_source.progress_update.connect(self.update_progress)
+            progress_source.time_update.connect(self.update_time)
+        
+        # 会话日志与日志区域接收相同的事件，写入由后台线程完成
+        if self.session_log_path:
+            self.session_log = SessionLog(self.session_log_path, self.texts, self.session_log_compression)
+            log_source.new_logs.connect(self.session_log.write_logs)
+            log_source.module_change.connect(self.session_log.write_module)
         
-        # 追加文本
-        cursor = self.code_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertText(text + '\n', format)
-        self.code_text.setTextCursor(cursor)
-        self.code_text.ensureCursorVisible()
+        self.owns_scheduler = scheduler is None
+        self.scheduler = SCHEDULER_ENGINES[self.engine](self.duration) if scheduler is None else scheduler
+        
+        # 记录本窗口收到的所有事件（在界面线程中按收到的顺序写入，时间取调度器的模拟时间）
+        if self.record_path:
+            self.recorder = TimelineRecorder(self.record_path, self.duration, self.requested_mode, self.texts,
+                                             self.scheduler.scheduler)
+            log_source.new_logs.connect(self.recorder.record_logs)
+            log_source.module_change.connect(self.recorder.record_module)
+            progress_source.progress_update.connect(self.recorder.record_progress)
+            progress_source.time_update.connect(self.recorder.record_time)
+        
+        for task in self.tasks:
+            self.scheduler.add_task(task)
+        self.scheduler.finished.connect(self.simulation_finished)
+        self.scheduler.control_changed.connect(self.update_controls)
+        self.pause_button.clicked.connect(self.toggle_pause)
+        self.speed_combo.currentTextChanged.connect(self.change_speed)
+        self.update_controls(self.scheduler.paused, self.scheduler.speed)
+        if self.owns_scheduler:
+            self.scheduler.start()
+    
+    def append_log(self, text, color_type):
+        # 单独一行不在日志表中的文本
+        self.append_logs([log_entry(~0, color_type)], [text])
+    
+    def append_logs(self, entries, extra):
+        # 一批日志只追加一次，滚动和重绘由日志区域的渲染节拍完成
+        self.code_text.append_entries(entries, extra, self.texts)
     
     def change_module(self, module_name):
-        # 插入模块分隔符
-        separator = f'\n----- Starting Module: {module_name} -----\n'
-        format = QTextCharFormat()
-        format.setForeground(QColor('#00FFFF'))
-        format.setFontWeight(QFont.Bold)
-        
-        cursor = self.code_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertText(separator, format)
-        self.code_text.setTextCursor(cursor)
-        self.code_text.ensureCursorVisible()
+        # 插入模块分隔符（前面空一行）
+        self.code_text.append_lines([('', 'module'), (f'----- Starting Module: {module_name} -----', 'module')])
     
     def update_progress(self, main_val, secondary1_val, secondary2_val):
         self.main_progress.setValue(main_val)
         self.secondary1_progress.setValue(secondary1_val)
         self.secondary2_progress.setValue(secondary2_val)
-        
-        # 随机更新进度条标签
-        if random.random() < 0.01:  # 1%概率更新标签
-            labels = ['编译进度', '模型收敛度', '数据加载', '内存分配', '校验和计算']
-            self.main_progress_label.setText(random.choice(labels))
-            self.secondary1_label.setText(random.choice(labels))
-            self.secondary2_label.setText(random.choice(labels))
     
     def update_time(self, elapsed, remaining):
         self.elapsed_time = elapsed
         self.remaining_time = remaining
         
+        # 随机更新进度条标签（每秒调用一次，平均约10秒换一次），随机数按块预先抽取
+        if not self.label_draws:
+            self.label_draws = self.rng.random((RANDOM_BLOCK_SIZE, 4)).tolist()
+            self.label_draws.reverse()
+        change, *picks = self.label_draws.pop()
+        if change < 0.1:  # 10%概率更新标签
+            labels = PROGRESS_LABELS
+            self.main_progress_label.setText(labels[int(picks[0] * len(labels))])
+            self.secondary1_label.setText(labels[int(picks[1] * len(labels))])
+            self.secondary2_label.setText(labels[int(picks[2] * len(labels))])
+        
+        # 更新模式标题中的时间（重新计算预计完成时间）
+        if self.mode_parts is not None:
+            self.expected_completion = self.completion_time(parse_time(remaining))
+            self.mode_label.setText(self.expected_completion.join(self.mode_parts))
+        
         # 更新进度条上的时间
         if self.show_time_in_progress:
             self.main_progress_time.setText(f'剩余: {remaining}')
@@ -458,62 +1261,188 @@ class MainWindow(QMainWindow):
         # 更新状态栏
         if self.show_status_bar:
             self.status_label.setText(f'已运行: {elapsed} / 剩余: {remaining} / 预计完成: {self.expected_completion}')
-        
-        # 更新模式标题中的时间
-        if '预计' in self.mode and ':' in self.mode:
-            # 重新计算预计完成时间
-            completion_time = time.time() + int(self.duration)
-            self.expected_completion = time.strftime('%H:%M:%S', time.localtime(completion_time))
-            # 假设模式字符串格式是固定的，我们需要重新构建它
-            parts = self.mode.split('预计')
-            if len(parts) > 1:
-                time_part = parts[1].split('完成')[0]
-                new_mode = self.mode.replace(f'预计{time_part}完成', f'预计{self.expected_completion}完成')
-                self.mode_label.setText(new_mode)
+    
+    def completion_time(self, remaining):
+        # 当前时间加上剩余的模拟时间按当前速度换算成的真实时间，按本地时间显示为 HH:MM:SS（终端版相同）
+        # 夏令时在整点切换，按完成时刻的整点重新读取偏移，长时间执行跨过切换时也显示正确的时间
+        speed = self.scheduler.speed if hasattr(self, 'scheduler') else 1.0
+        completion = int(time.time() + remaining / speed)
+        hour = completion // 3600
+        if hour != self.offset_hour:
+            self.offset_hour = hour
+            self.utc_offset = time.localtime(completion).tm_gmtoff
+        return format_time((completion + self.utc_offset) % 86400)
+    
+    def toggle_pause(self):
+        self.scheduler.set_paused(not self.scheduler.paused)
+    
+    def change_speed(self, text):
+        self.scheduler.set_speed(SIMULATION_SPEEDS[text])
+    
+    def update_controls(self, paused, speed):
+        # 共用调度线程的所有窗口保持一致的控制状态
+        self.pause_button.setText('继续' if paused else '暂停')
+        for text, value in SIMULATION_SPEEDS.items():
+            if value == speed:
+                self.speed_combo.blockSignals(True)
+                self.speed_combo.setCurrentText(text)
+                self.speed_combo.blockSignals(False)
     
     def simulation_finished(self):
         # 任务完成后，更改标题并显示完成消息
         self.mode_label.setText('任务执行完毕！')
-        self.mode_label.setStyleSheet('color: #00FF00; background-color: #1E1E1E; padding: 10px;')
+        self.mode_label.setProperty('finished', True)
+        # 动态属性变化后需要重新应用样式
+        self.mode_label.style().unpolish(self.mode_label)
+        self.mode_label.style().polish(self.mode_label)
+        
+        self.pause_button.setEnabled(False)
+        self.speed_combo.setEnabled(False)
+        
+        # 追加完成日志（收录在共享日志表中，回放的日志表同样包含）
+        summary = load_snippet_index().finished
+        self.append_logs(summary, [])
         
-        # 追加完成日志
-        self.append_log('\n========================================', 'progress')
-        self.append_log('任务执行完毕！系统已恢复正常状态。', 'success')
-        self.append_log('所有模块已成功完成。', 'success')
-        self.append_log('========================================\n', 'progress')
+        # 完成前的所有事件都已收到，记录和会话日志可以结束了
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.session_log is not None:
+            self.session_log.write_logs(summary, [])
+            self.session_log.close()
         
         # 3秒后自动关闭窗口
         QTimer.singleShot(3000, self.close)
     
-    def format_time(self, seconds):
-        hours, remainder = divmod(int(seconds), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
-    
     def closeEvent(self, event):
-        # 停止线程
-        if hasattr(self, 'log_generator') and self.log_generator.isRunning():
-            self.log_generator.stop()
-        if hasattr(self, 'progress_manager') and self.progress_manager.isRunning():
-            self.progress_manager.stop()
+        # 停止调度线程；共享调度线程时只移除自己的任务
+        if hasattr(self, 'scheduler') and self.scheduler.isRunning():
+            if self.owns_scheduler:
+                self.scheduler.stop()
+            else:
+                for task in self.tasks:
+                    self.scheduler.remove_task(task)
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.session_log is not None:
+            self.session_log.close()
+        if self.metrics is not None:
+            self.metrics.stop()
         event.accept()
+        # 完成后的自动关闭可能和手动关闭重叠，只通知一次
+        if not self.is_closed:
+            self.is_closed = True
+            self.closed.emit()
+
+class ExecutionSession(QObject):
+    # 一次执行会话：一个或多个执行窗口共用一个调度线程，每个窗口只接收自己那一路日志和进度
+    closed = pyqtSignal()
+    
+    def __init__(self, window_count, mode, duration, show_time_in_progress, show_status_bar,
+                 max_log_lines=DEFAULT_MAX_LOG_LINES, corpus_paths=(), corpus_replay=False,
+                 record=False, replay_path=None, replay_speed=1.0, instrument=False, metrics_path=None,
+                 seed=None, engine='thread', session_log=False, session_log_compression='gzip'):
+        super().__init__()
+        # 回放时每个窗口各自读取同一个记录文件，模式和时长以记录为准
+        replays = [None] * window_count
+        if replay_path:
+            replays = [TimelineReplay(replay_path, replay_speed) for _ in range(window_count)]
+            mode = replays[0].mode
+            duration = replays[0].duration
+        
+        # 记录和会话日志都是每个窗口写一个文件
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        names = [stamp] if window_count == 1 else [f'{stamp}-{index + 1}' for index in range(window_count)]
+        record_paths = [None] * window_count
+        if record:
+            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            record_paths = [os.path.join(RECORDINGS_DIR, name + TIMELINE_SUFFIX) for name in names]
+        session_log_paths = [None] * window_count
+        if session_log:
+            os.makedirs(SESSION_LOGS_DIR, exist_ok=True)
+            session_log_paths = [os.path.join(SESSION_LOGS_DIR, name + SESSION_LOG_SUFFIX) for name in names]
+        
+        # 外部语料的内存映射由所有窗口共享，每个窗口有自己的读取位置
+        self.corpus = LogCorpus(corpus_paths) if corpus_paths and not replay_path else None
+        # 本次执行的种子，每个窗口派生一个子种子；用同一个种子再次执行可以得到相同的结果
+        seed_sequence = load_numpy().random.SeedSequence(seed)
+        self.seed = seed_sequence.entropy
+        if sys.stderr and not replay_path:
+            print(f'seed: {self.seed}', file=sys.stderr)
+        window_seeds = seed_sequence.spawn(window_count)
+        
+        self.scheduler = SCHEDULER_ENGINES[engine](duration)
+        self.windows = [
+            MainWindow(mode, duration, show_time_in_progress, show_status_bar, max_log_lines,
+                       scheduler=self.scheduler, corpus=self.corpus, corpus_replay=corpus_replay,
+                       record_path=record_path, replay=replay,
+                       instrument=instrument, metrics_path=metrics_path, name=str(index + 1),
+                       seed=window_seed, session_log_path=session_log_path,
+                       session_log_compression=session_log_compression)
+            for index, (record_path, replay, window_seed, session_log_path)
+            in enumerate(zip(record_paths, replays, window_seeds, session_log_paths))
+        ]
+        self.open_windows = window_count
+        for window in self.windows:
+            window.closed.connect(self.window_closed)
+    
+    def start(self):
+        if len(self.windows) > 1:
+            self.arrange_windows()
+        for window in self.windows:
+            window.show()
+        self.scheduler.start()
+    
+    def arrange_windows(self):
+        # 屏幕够用时每个屏幕一个窗口，否则在主屏幕上平铺
+        screens = QApplication.screens()
+        if len(self.windows) <= len(screens):
+            for window, screen in zip(self.windows, screens):
+                window.setGeometry(screen.availableGeometry())
+            return
+        area = QApplication.primaryScreen().availableGeometry()
+        columns = math.ceil(math.sqrt(len(self.windows)))
+        rows = math.ceil(len(self.windows) / columns)
+        width = area.width() // columns
+        height = area.height() // rows
+        for index, window in enumerate(self.windows):
+            row, column = divmod(index, columns)
+            window.setGeometry(area.x() + column * width, area.y() + row * height, width, height)
+    
+    def window_closed(self):
+        self.open_windows -= 1
+        if self.open_windows == 0:
+            if self.scheduler.isRunning():
+                self.scheduler.stop()
+            if self.corpus is not None:
+                self.corpus.close()
+            self.closed.emit()
 
 class ConfigWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, metrics_path=None, seed=None, engine='thread'):
         super().__init__()
+        self.startup_ms = None
+        self.metrics_path = metrics_path
+        self.seed = seed
+        self.engine = engine
+        apply_theme()
         self.init_ui()
     
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # 首次绘制时记录启动耗时，随后在空闲时预加载执行窗口才需要的模块
+        if self.startup_ms is None:
+            self.startup_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+            if sys.stderr:
+                print(f'startup: {self.startup_ms:.1f} ms', file=sys.stderr)
+            QTimer.singleShot(0, load_numpy)
+    
     def init_ui(self):
         # 设置窗口属性
         self.setWindowTitle('陈狗模型检测代码执行器')
-        self.setGeometry(400, 300, 500, 400)
-        
-        # 设置黑色主题
-        self.setStyleSheet('background-color: #000000;')
+        self.setGeometry(400, 300, 500, 570)
         
         # 主布局
         central_widget = QWidget()
-        central_widget.setStyleSheet('background-color: #000000;')
         main_layout = QVBoxLayout(central_widget)
         main_layout.setContentsMargins(20, 20, 20, 20)
         self.setCentralWidget(central_widget)
@@ -521,155 +1450,449 @@ class ConfigWindow(QMainWindow):
         # 模式选择
         mode_label = QLabel('选择执行模式：')
         mode_label.setFont(QFont('SimHei', 12))
-        mode_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         main_layout.addWidget(mode_label)
         
         self.mode_combo = QComboBox()
-        self.mode_combo.addItems([
-            '正在编译中，请勿关闭窗口',
-            '正在训练模型，预计XX:XX:XX完成',
-            '深度数据挖掘中，请勿触碰输入设备',
-            '系统内核优化进行时，避免移动鼠标',
-            '模型定义构建初始化中...',
-            '检测到FLUX大模型损坏，自检协议运行中..请勿触碰输入设备。'
-        ])
+        self.mode_combo.addItems(list(MODES))
         self.mode_combo.setFont(QFont('SimHei', 10))
-        self.mode_combo.setStyleSheet(
-            "QComboBox {" 
-            "    background-color: #000000;" 
-            "    color: #FFFFFF;" 
-            "    border: 2px solid #333333;" 
-            "    border-radius: 5px;" 
-            "    padding: 5px;" 
-            "}" 
-            "QComboBox::drop-down {" 
-            "    border-left: 2px solid #333333;" 
-            "    background-color: #111111;" 
-            "}" 
-            "QComboBox QAbstractItemView {" 
-            "    background-color: #000000;" 
-            "    color: #FFFFFF;" 
-            "    border: 2px solid #333333;" 
-            "}"
-        )
         main_layout.addWidget(self.mode_combo)
         
         # 持续时间设置
-        time_label = QLabel('执行时间（分钟）：')
+        time_label = QLabel('执行时间：')
         time_label.setFont(QFont('SimHei', 12))
-        time_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         main_layout.addWidget(time_label)
         
         time_layout = QHBoxLayout()
+        self.hours_spin = QSpinBox()
+        self.hours_spin.setRange(0, MAX_DURATION // 3600)
+        self.hours_spin.setValue(0)
+        self.hours_spin.setFont(QFont('SimHei', 10))
+        hours_label = QLabel('小时')
+        hours_label.setFont(QFont('SimHei', 10))
+        
         self.minutes_spin = QSpinBox()
-        self.minutes_spin.setRange(1, 60)
+        self.minutes_spin.setRange(0, 59)
         self.minutes_spin.setValue(5)
         self.minutes_spin.setFont(QFont('SimHei', 10))
-        self.minutes_spin.setStyleSheet(
-            "QSpinBox {" 
-            "    background-color: #000000;" 
-            "    color: #FFFFFF;" 
-            "    border: 2px solid #333333;" 
-            "    border-radius: 5px;" 
-            "    padding: 5px;" 
-            "}"
-        )
         minutes_label = QLabel('分钟')
         minutes_label.setFont(QFont('SimHei', 10))
-        minutes_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         
         self.seconds_spin = QSpinBox()
         self.seconds_spin.setRange(0, 59)
         self.seconds_spin.setValue(0)
         self.seconds_spin.setFont(QFont('SimHei', 10))
-        self.seconds_spin.setStyleSheet(
-            "QSpinBox {" 
-            "    background-color: #000000;" 
-            "    color: #FFFFFF;" 
-            "    border: 2px solid #333333;" 
-            "    border-radius: 5px;" 
-            "    padding: 5px;" 
-            "}"
-        )
         seconds_label = QLabel('秒')
         seconds_label.setFont(QFont('SimHei', 10))
-        seconds_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         
+        time_layout.addWidget(self.hours_spin)
+        time_layout.addWidget(hours_label)
         time_layout.addWidget(self.minutes_spin)
         time_layout.addWidget(minutes_label)
         time_layout.addWidget(self.seconds_spin)
         time_layout.addWidget(seconds_label)
         main_layout.addLayout(time_layout)
         
+        # 日志保留行数设置
+        log_lines_label = QLabel('日志保留行数：')
+        log_lines_label.setFont(QFont('SimHei', 12))
+        main_layout.addWidget(log_lines_label)
+        
+        self.log_lines_spin = QSpinBox()
+        self.log_lines_spin.setRange(100, 100000)
+        self.log_lines_spin.setSingleStep(500)
+        self.log_lines_spin.setValue(DEFAULT_MAX_LOG_LINES)
+        self.log_lines_spin.setFont(QFont('SimHei', 10))
+        main_layout.addWidget(self.log_lines_spin)
+        
+        # 窗口数量设置（多个窗口共用一个调度线程）
+        window_count_label = QLabel('执行窗口数量：')
+        window_count_label.setFont(QFont('SimHei', 12))
+        main_layout.addWidget(window_count_label)
+        
+        self.window_count_spin = QSpinBox()
+        self.window_count_spin.setRange(1, 16)
+        self.window_count_spin.setValue(1)
+        self.window_count_spin.setFont(QFont('SimHei', 10))
+        main_layout.addWidget(self.window_count_spin)
+        
+        # 外部日志语料（可选）
+        corpus_label = QLabel('外部日志语料：')
+        corpus_label.setFont(QFont('SimHei', 12))
+        main_layout.addWidget(corpus_label)
+        
+        self.corpus_paths = []
+        corpus_layout = QHBoxLayout()
+        self.corpus_button = QPushButton('选择文件...')
+        self.corpus_button.setFont(QFont('SimHei', 10))
+        self.corpus_button.clicked.connect(self.choose_corpus)
+        self.corpus_files_label = QLabel('未选择（使用内置日志）')
+        self.corpus_files_label.setFont(QFont('SimHei', 10))
+        self.corpus_replay = QCheckBox('按顺序回放')
+        self.corpus_replay.setFont(QFont('SimHei', 10))
+        corpus_layout.addWidget(self.corpus_button)
+        corpus_layout.addWidget(self.corpus_files_label, 1)
+        corpus_layout.addWidget(self.corpus_replay)
+        main_layout.addLayout(corpus_layout)
+        
+        # 记录与回放
+        recording_label = QLabel('记录与回放：')
+        recording_label.setFont(QFont('SimHei', 12))
+        main_layout.addWidget(recording_label)
+        
+        recording_layout = QHBoxLayout()
+        self.record_check = QCheckBox(f'记录本次执行（保存到 {RECORDINGS_DIR} 目录）')
+        self.record_check.setFont(QFont('SimHei', 10))
+        self.replay_speed_combo = QComboBox()
+        self.replay_speed_combo.addItems(list(REPLAY_SPEEDS))
+        self.replay_speed_combo.setFont(QFont('SimHei', 10))
+        self.replay_button = QPushButton('回放记录...')
+        self.replay_button.setFont(QFont('SimHei', 10))
+        self.replay_button.clicked.connect(self.start_replay)
+        recording_layout.addWidget(self.record_check, 1)
+        recording_layout.addWidget(self.replay_speed_combo)
+        recording_layout.addWidget(self.replay_button)
+        main_layout.addLayout(recording_layout)
+        
+        # 会话日志：保存滚动过的全部日志，按大小轮换并压缩
+        session_log_layout = QHBoxLayout()
+        self.session_log_check = QCheckBox(f'保存会话日志（保存到 {SESSION_LOGS_DIR} 目录，按大小轮换）')
+        self.session_log_check.setFont(QFont('SimHei', 10))
+        self.session_log_compression_combo = QComboBox()
+        self.session_log_compression_combo.addItems(list(SESSION_LOG_COMPRESSIONS))
+        self.session_log_compression_combo.setFont(QFont('SimHei', 10))
+        session_log_layout.addWidget(self.session_log_check, 1)
+        session_log_layout.addWidget(self.session_log_compression_combo)
+        main_layout.addLayout(session_log_layout)
+        
         # 时间显示选项
         options_label = QLabel('时间显示选项：')
         options_label.setFont(QFont('SimHei', 12))
-        options_label.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         main_layout.addWidget(options_label)
         
         self.show_time_in_progress = QCheckBox('在进度条上显示剩余时间')
         self.show_time_in_progress.setChecked(True)
         self.show_time_in_progress.setFont(QFont('SimHei', 10))
-        self.show_time_in_progress.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         main_layout.addWidget(self.show_time_in_progress)
         
         self.show_status_bar = QCheckBox('在状态栏显示详细时间信息')
         self.show_status_bar.setChecked(True)
         self.show_status_bar.setFont(QFont('SimHei', 10))
-        self.show_status_bar.setStyleSheet('color: #FFFFFF; background-color: #000000;')
         main_layout.addWidget(self.show_status_bar)
         
+        # 性能监控（指定了 --metrics 时默认开启并写入该文件）
+        self.instrument_check = QCheckBox('显示性能监控（槽函数耗时、信号延迟、事件循环卡顿）')
+        self.instrument_check.setChecked(bool(self.metrics_path))
+        self.instrument_check.setFont(QFont('SimHei', 10))
+        main_layout.addWidget(self.instrument_check)
+        
+        # 单线程模式：不创建调度线程，日志和进度在界面线程的事件循环中生成
+        self.event_loop_check = QCheckBox('单线程模式（在界面事件循环中生成日志和进度）')
+        self.event_loop_check.setChecked(self.engine == 'eventloop')
+        self.event_loop_check.setFont(QFont('SimHei', 10))
+        main_layout.addWidget(self.event_loop_check)
+        
         # 执行按钮
         button_layout = QHBoxLayout()
         self.start_button = QPushButton('开始执行')
+        self.start_button.setObjectName('startButton')
         self.start_button.setFont(QFont('SimHei', 14, QFont.Bold))
-        self.start_button.setStyleSheet(
-            "QPushButton {" 
-            "    background-color: #4CAF50;" 
-            "    color: white;" 
-            "    padding: 10px;" 
-            "    border-radius: 5px;" 
-            "    border: none;" 
-            "}" 
-            "QPushButton:hover {" 
-            "    background-color: #45a049;" 
-            "}" 
-            "QPushButton:pressed {" 
-            "    background-color: #3d8b40;" 
-            "}"
-        )
         self.start_button.clicked.connect(self.start_execution)
         button_layout.addWidget(self.start_button)
         main_layout.addLayout(button_layout)
     
-    def start_execution(self):
+    def choose_corpus(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, '选择日志文件', '', '日志文件 (*.log *.txt);;所有文件 (*)')
+        self.corpus_paths = paths
+        self.corpus_files_label.setText(f'已选择 {len(paths)} 个文件' if paths else '未选择（使用内置日志）')
+    
+    def start_replay(self):
+        path, _ = QFileDialog.getOpenFileName(self, '选择执行记录', RECORDINGS_DIR, f'执行记录 (*{TIMELINE_SUFFIX});;所有文件 (*)')
+        if path:
+            self.start_execution(replay_path=path)
+    
+    def start_execution(self, replay_path=None):
         # 获取用户选择的选项
         mode = self.mode_combo.currentText()
+        hours = self.hours_spin.value()
         minutes = self.minutes_spin.value()
         seconds = self.seconds_spin.value()
-        duration = minutes * 60 + seconds
+        # 总时长限制在1秒到MAX_DURATION之间
+        duration = min(max(hours * 3600 + minutes * 60 + seconds, 1), MAX_DURATION)
         show_time_in_progress = self.show_time_in_progress.isChecked()
         show_status_bar = self.show_status_bar.isChecked()
+        max_log_lines = self.log_lines_spin.value()
+        window_count = self.window_count_spin.value()
+        corpus_replay = self.corpus_replay.isChecked()
+        record = self.record_check.isChecked()
+        replay_speed = REPLAY_SPEEDS[self.replay_speed_combo.currentText()]
+        instrument = self.instrument_check.isChecked()
+        engine = 'eventloop' if self.event_loop_check.isChecked() else 'thread'
+        session_log = self.session_log_check.isChecked()
+        session_log_compression = self.session_log_compression_combo.currentText()
+        
+        # 创建执行窗口，全部窗口关闭后重新显示配置窗口
+        try:
+            self.session = ExecutionSession(window_count, mode, duration, show_time_in_progress, show_status_bar,
+                                            max_log_lines, self.corpus_paths, corpus_replay,
+                                            record, replay_path, replay_speed,
+                                            instrument, self.metrics_path if instrument else None, self.seed, engine,
+                                            session_log, session_log_compression)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, '陈狗模型检测代码执行器', f'无法打开文件：{e}')
+            return
+        self.session.closed.connect(self.show)
         
         # 隐藏配置窗口并显示执行窗口
         self.hide()
+        self.session.start()
+
+# 常驻启动器的本地控制通道名称（Unix上是临时目录中的套接字文件，Windows上是命名管道）
+LAUNCHER_SERVER_NAME = 'chen-ai-simulation'
+# 预先构建好的执行窗口数量
+LAUNCHER_POOL_SIZE = 1
+# 取走预构建窗口后稍等再补充，避免构建新窗口时卡住刚开始执行的窗口
+LAUNCHER_REFILL_DELAY = 500  # ms
+LAUNCHER_TIMEOUT = 3000  # ms，客户端连接和等待回复的超时
+
+# QtNetwork只有常驻启动器和--send才需要，普通启动时不加载
+QtNetwork = None
+
+def load_qt_network():
+    global QtNetwork
+    if QtNetwork is None:
+        from PyQt5 import QtNetwork as module
+        QtNetwork = module
+    return QtNetwork
+
+class ResidentLauncher(QObject):
+    # 常驻启动器：保持QApplication和若干预先构建好、已应用样式的执行窗口，通过本地控制通道接收命令。
+    # 开始执行时只需设置模式、时长和种子并启动调度，不再经过配置窗口和窗口构建。
+    # 每条命令一行，每条命令回复一行JSON：
+    #   start                     用当前设置开始一次执行（单窗口），回复会话编号和种子
+    #   stop [ID]                 停止指定的执行，不指定时停止全部
+    #   status                    当前设置、预构建窗口数和正在执行的会话
+    #   mode 编号|名称            设置之后执行的模式（编号从1开始）
+    #   duration 秒数|HH:MM:SS    设置之后执行的时长
+    #   seed 种子|random          设置之后执行的随机种子
+    #   quit                      停止全部执行并退出
+    def __init__(self, name=LAUNCHER_SERVER_NAME, pool_size=LAUNCHER_POOL_SIZE, engine='thread',
+                 metrics_path=None, seed=None):
+        super().__init__()
+        self.pool_size = pool_size
+        self.engine = engine
+        self.metrics_path = metrics_path
+        self.mode = next(iter(MODES))
+        self.duration = 300
+        self.seed = seed
+        self.pool = []
+        self.sessions = {}
+        self.last_session = 0
+        # 命令 -> (处理函数, 最少参数个数, 最多参数个数)，None表示不限；模式名称中可以有空格
+        self.commands = {
+            'start': (self.start_session, 0, 0),
+            'stop': (self.stop_session, 0, 1),
+            'status': (self.status, 0, 0),
+            'mode': (self.set_mode, 1, None),
+            'duration': (self.set_duration, 1, 1),
+            'seed': (self.set_seed, 1, 1),
+            'quit': (self.quit, 0, 0),
+        }
+        
+        # 已有启动器在监听时不抢占；否则清理上次异常退出残留的套接字
+        network = load_qt_network()
+        probe = network.QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(LAUNCHER_TIMEOUT):
+            probe.disconnectFromServer()
+            raise OSError(f'常驻启动器已在运行：{name}')
+        network.QLocalServer.removeServer(name)
+        self.server = network.QLocalServer(self)
+        if not self.server.listen(name):
+            raise OSError(f'无法监听 {name}：{self.server.errorString()}')
+        self.server.newConnection.connect(self.accept)
         
-        # 创建并显示主执行窗口
-        self.main_window = MainWindow(mode, duration, show_time_in_progress, show_status_bar)
-        self.main_window.show()
-        self.main_window.closeEvent = self.on_main_window_closed
+        # 执行窗口才需要的模块和索引也提前加载
+        simulation_core.load_snippet_index()
+        self.fill_pool()
     
-    def on_main_window_closed(self, event):
-        # 当主窗口关闭时，重新显示配置窗口
-        self.show()
-        event.accept()
+    def build_window(self):
+        window = MainWindow(self.mode, self.duration, True, True, autostart=False,
+                            instrument=bool(self.metrics_path), metrics_path=self.metrics_path, engine=self.engine)
+        # 提前应用样式、创建原生窗口
+        window.ensurePolished()
+        window.winId()
+        return window
+    
+    def fill_pool(self):
+        # 每次只构建一个窗口，其余的下一轮事件循环再构建，不长时间占用界面线程
+        if len(self.pool) < self.pool_size:
+            self.pool.append(self.build_window())
+            if len(self.pool) < self.pool_size:
+                QTimer.singleShot(0, self.fill_pool)
+    
+    def accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            # 通过sender()取得套接字，不用捕获套接字的lambda：那样形成的引用环被垃圾回收后连接会静默断开
+            socket.readyRead.connect(self.read_commands)
+            socket.disconnected.connect(socket.deleteLater)
+    
+    def read_commands(self):
+        socket = self.sender()
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode('utf-8', 'replace').strip()
+            if line:
+                reply = self.execute(line)
+                socket.write((json.dumps(reply, ensure_ascii=False) + '\n').encode('utf-8'))
+        socket.flush()
+    
+    def execute(self, line):
+        # 格式不对的命令只回复错误，不能让异常离开槽函数（PyQt5会因此终止整个常驻进程）
+        command, *args = line.split()
+        if command not in self.commands:
+            return {'ok': False, 'error': f'未知命令：{command}'}
+        handler, min_args, max_args = self.commands[command]
+        if len(args) < min_args or (max_args is not None and len(args) > max_args):
+            return {'ok': False, 'error': f'参数个数不正确：{line}'}
+        try:
+            return {'ok': True, **handler(*args)}
+        except (ValueError, OSError) as e:
+            return {'ok': False, 'error': str(e)}
+    
+    def start_session(self):
+        window = self.pool.pop() if self.pool else self.build_window()
+        # 与配置窗口的单窗口执行相同的种子派生方式，同一个种子得到相同的日志
+        seed_sequence = load_numpy().random.SeedSequence(self.seed)
+        window.configure(self.mode, self.duration, seed_sequence.spawn(1)[0])
+        self.last_session += 1
+        session_id = self.last_session
+        window.name = str(session_id)
+        window.closed.connect(self.session_closed)
+        self.sessions[session_id] = window
+        window.show()
+        window.start_simulation()
+        QTimer.singleShot(LAUNCHER_REFILL_DELAY, self.fill_pool)
+        return {'session': session_id, 'seed': seed_sequence.entropy}
+    
+    def stop_session(self, session_id=None):
+        if session_id is None:
+            windows = list(self.sessions.values())
+        elif session_id.isdigit() and int(session_id) in self.sessions:
+            windows = [self.sessions[int(session_id)]]
+        else:
+            raise ValueError(f'没有正在执行的会话：{session_id}')
+        for window in windows:
+            window.close()
+        return {'stopped': len(windows)}
+    
+    def session_closed(self):
+        window = self.sender()
+        del self.sessions[int(window.name)]
+        window.deleteLater()
+    
+    def status(self):
+        sessions = [
+            {'session': session_id, 'mode': window.mode, 'duration': window.duration,
+             'elapsed': window.elapsed_time, 'remaining': window.remaining_time, 'paused': window.scheduler.paused}
+            for session_id, window in self.sessions.items()
+        ]
+        return {'mode': self.mode, 'duration': self.duration, 'seed': self.seed,
+                'ready': len(self.pool), 'sessions': sessions}
+    
+    def set_mode(self, *words):
+        text = ' '.join(words)
+        modes = list(MODES)
+        if text.isdigit() and 1 <= int(text) <= len(modes):
+            text = modes[int(text) - 1]
+        if text not in MODES:
+            raise ValueError(f'未知模式：{text}')
+        self.mode = text
+        return {'mode': self.mode}
+    
+    def set_duration(self, text):
+        try:
+            duration = parse_time(text) if ':' in text else int(text)
+        except ValueError:
+            raise ValueError(f'无效的时长：{text}') from None
+        # 与配置窗口相同，限制在1秒到MAX_DURATION之间
+        self.duration = min(max(duration, 1), MAX_DURATION)
+        return {'duration': self.duration}
+    
+    def set_seed(self, text):
+        if text != 'random' and not text.isdigit():
+            raise ValueError(f'无效的种子：{text}')
+        self.seed = None if text == 'random' else int(text)
+        return {'seed': self.seed}
+    
+    def quit(self):
+        self.stop_session()
+        self.server.close()
+        # 先把回复发出去再退出
+        QTimer.singleShot(0, QApplication.quit)
+        return {}
+
+def send_launcher_commands(commands, name=LAUNCHER_SERVER_NAME):
+    # 向常驻启动器依次发送命令，返回每条命令的回复
+    socket = load_qt_network().QLocalSocket()
+    socket.connectToServer(name)
+    if not socket.waitForConnected(LAUNCHER_TIMEOUT):
+        raise OSError(f'无法连接常驻启动器 {name}：{socket.errorString()}')
+    replies = []
+    for command in commands:
+        socket.write((command + '\n').encode('utf-8'))
+        socket.waitForBytesWritten(LAUNCHER_TIMEOUT)
+        while not socket.canReadLine():
+            if not socket.waitForReadyRead(LAUNCHER_TIMEOUT):
+                raise OSError(f'常驻启动器没有回复：{command}')
+        replies.append(json.loads(bytes(socket.readLine()).decode('utf-8')))
+    socket.disconnectFromServer()
+    return replies
 
 if __name__ == '__main__':
     # 确保中文显示正常
-    import os
     os.environ['QT_FONT_DPI'] = '96'
     
-    app = QApplication(sys.argv)
-    config_window = ConfigWindow()
-    config_window.show()
+    parser = argparse.ArgumentParser(description='陈狗模型检测代码执行器')
+    parser.add_argument('--replay', metavar='FILE', help='直接回放执行记录，不显示配置窗口')
+    parser.add_argument('--replay-speed', type=float, default=1.0, help='回放速度倍数，0表示尽快回放')
+    parser.add_argument('--seed', type=int, help='随机种子，相同种子的执行产生相同的日志和进度（默认每次随机）')
+    parser.add_argument('--engine', choices=list(SCHEDULER_ENGINES), default='thread',
+                        help='调度引擎：thread为独立调度线程，eventloop在界面事件循环中运行')
+    parser.add_argument('--metrics', metavar='FILE', help='开启性能监控，每秒把指标按行追加写入该JSON文件')
+    parser.add_argument('--daemon', action='store_true', help='常驻运行，保持预先构建好的执行窗口，通过本地控制通道接收命令')
+    parser.add_argument('--pool', type=int, default=LAUNCHER_POOL_SIZE, help='常驻运行时预先构建的执行窗口数量')
+    parser.add_argument('--server', default=LAUNCHER_SERVER_NAME, help='常驻启动器的控制通道名称')
+    parser.add_argument('--send', nargs='+', metavar='COMMAND',
+                        help='向常驻启动器发送命令（如 "mode 2" "duration 60" start），每条回复输出一行JSON')
+    args, qt_args = parser.parse_known_args()
+    
+    if args.send:
+        # 客户端只需要本地套接字，不创建任何窗口
+        try:
+            replies = send_launcher_commands(args.send, args.server)
+        except OSError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        for reply in replies:
+            print(json.dumps(reply, ensure_ascii=False))
+        sys.exit(0 if all(reply['ok'] for reply in replies) else 1)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    if args.daemon:
+        # 常驻运行时没有可见窗口也不退出，只有quit命令才退出
+        app.setQuitOnLastWindowClosed(False)
+        try:
+            launcher = ResidentLauncher(args.server, args.pool, args.engine, args.metrics, args.seed)
+        except OSError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+    elif args.replay:
+        # 回放窗口关闭后直接退出，便于脚本化的性能分析
+        session = ExecutionSession(1, None, None, True, True, replay_path=args.replay, replay_speed=args.replay_speed,
+                                   instrument=bool(args.metrics), metrics_path=args.metrics, engine=args.engine)
+        session.closed.connect(app.quit)
+        session.start()
+    else:
+        config_window = ConfigWindow(args.metrics, args.seed, args.engine)
+        config_window.show()
     sys.exit(app.exec_())
\ No newline at end of file
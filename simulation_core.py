@@ -0,0 +1,1000 @@
+# 与界面无关的模拟核心：日志生成、进度轨迹、调度时钟和会话日志导出
+#
+# 不导入任何Qt模块，可以被不同的显示后端共用：
+#   chen_ai_simulation.py - PyQt5窗口，把这里的事件转为Qt信号，在独立线程中运行调度器
+#   terminal_simulation.py - 终端界面，用ANSI转义序列在当前线程中直接绘制
+import os
+import re
+import sys
+import gzip
+import mmap
+import time
+import heapq
+import queue
+import bisect
+import operator
+import threading
+
+# NumPy只在开始执行时才需要，延迟导入可以让界面更快显示
+np = None
+
+def load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+def spawn_seeds(seed, count):
+    # 从一次执行的种子派生出count个互不相关的子种子，每个组件各用一个独立的生成器
+    # seed可以是整数、None（使用系统熵）或已派生的SeedSequence
+    load_numpy()
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(count)
+
+class Event:
+    # 最简单的同步事件：connect登记回调，emit在发送方的线程中按登记顺序逐个调用
+    # 接口与Qt信号一致，显示后端可以直接把Qt信号的emit登记进来
+    def __init__(self):
+        self.callbacks = []
+    
+    def connect(self, callback):
+        self.callbacks.append(callback)
+    
+    def emit(self, *args):
+        for callback in self.callbacks:
+            callback(*args)
+
+# 日志批量发送参数：累计超过该时间或条数就一次性发送给显示端
+LOG_BATCH_INTERVAL = 0.05  # seconds
+LOG_BATCH_SIZE = 64
+
+# 日志颜色类型，下标就是颜色ID
+LOG_COLORS = ('normal', 'error', 'success', 'progress', 'module')
+LOG_COLOR_IDS = {color_type: index for index, color_type in enumerate(LOG_COLORS)}
+# 一批日志以整数条目的列表发送，每个条目是 文本ID << LOG_COLOR_BITS | 颜色ID：
+# 文本ID >= 0 时是共享日志表（SnippetIndex.texts）中的下标，所有线程只读；
+# 不在表中的行（如外部语料）随批次附带一个文本列表，文本ID为 ~下标（负数）
+LOG_COLOR_BITS = 3
+LOG_COLOR_MASK = (1 << LOG_COLOR_BITS) - 1
+
+def log_entry(text_id, color_type):
+    return text_id << LOG_COLOR_BITS | LOG_COLOR_IDS[color_type]
+
+def resolve_logs(entries, extra, texts):
+    # 把一批条目还原为 (text, color_type)，texts是发送方的日志表
+    for entry in entries:
+        text_id = entry >> LOG_COLOR_BITS
+        yield texts[text_id] if text_id >= 0 else extra[~text_id], LOG_COLORS[entry & LOG_COLOR_MASK]
+
+def format_time(seconds):
+    # 秒数 -> HH:MM:SS，各执行器的计时显示和执行记录共用
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+def parse_time(text):
+    # HH:MM:SS -> 秒数，format_time的逆运算
+    hours, minutes, seconds = text.split(':')
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+class Scheduler:
+    # 单一模拟时钟驱动所有任务：在调用run()的线程中按到期时间排序的优先队列依次执行
+    # 任务需实现 steps(clock)（生成器，每次yield下一次执行前等待的模拟秒数）和 finish(clock)
+    # 模拟时间 = 上次改变速度或暂停状态时的模拟时间 + 之后经过的真实时间 × 速度倍数，暂停时不前进
+    def __init__(self, duration):
+        self.finished = Event()
+        self.control_changed = Event()  # (paused, speed)
+        self.duration = duration  # seconds
+        self.running = True
+        self.now = 0.0  # 当前这一轮调度的模拟时间
+        self.paused = False
+        self.speed = 1.0
+        self.virtual_base = 0.0
+        self.real_base = None
+        self.tasks = []
+        self.queue = []
+        self.removed = set()
+        self.condition = threading.Condition()
+    
+    def add_task(self, task):
+        self.tasks.append(task)
+    
+    def remove_task(self, task):
+        # 可在运行中从其他线程调用，任务下一次到期时被丢弃，其余任务不受影响
+        with self.condition:
+            self.removed.add(task)
+            self.condition.notify_all()
+    
+    def virtual_time(self):
+        # 调用方需持有condition
+        if self.paused or self.real_base is None:
+            return self.virtual_base
+        return self.virtual_base + (time.monotonic() - self.real_base) * self.speed
+    
+    def set_control(self, paused, speed):
+        # 可在任意线程调用；唤醒调度线程按新的速度重新计算等待时间，下一帧内生效
+        # 速度倍数必须为正：为0时无法换算等待时间，为负时模拟时间倒退、调度线程空转
+        if speed <= 0:
+            raise ValueError(f'速度倍数必须大于0：{speed}')
+        with self.condition:
+            self.virtual_base = self.virtual_time()
+            self.real_base = time.monotonic()
+            self.paused = paused
+            self.speed = speed
+            self.condition.notify_all()
+        self.control_changed.emit(paused, speed)
+    
+    def set_paused(self, paused):
+        self.set_control(paused, self.speed)
+    
+    def set_speed(self, speed):
+        self.set_control(self.paused, speed)
+    
+    def elapsed(self):
+        # 同一轮调度中所有任务看到的是同一个时间点
+        return min(self.now, self.duration)
+    
+    def begin(self):
+        # 开始计时，建立任务队列：(到期的模拟时间, 序号, 任务步骤生成器)，序号保证同时到期时按添加顺序执行
+        with self.condition:
+            self.real_base = time.monotonic()
+        self.queue = [(0.0, index, task.steps(self)) for index, task in enumerate(self.tasks)]
+        heapq.heapify(self.queue)
+    
+    def advance(self):
+        # 执行所有已到期的任务步骤，返回下一个任务到期的模拟时间（不超过结束时间）；
+        # 已停止、没有任务或到达结束时间时返回None
+        queue = self.queue
+        while self.running and queue:
+            due, index, steps = queue[0]
+            if self.tasks[index] in self.removed:
+                heapq.heappop(queue)
+                steps.close()
+                continue
+            with self.condition:
+                now = self.now = self.virtual_time()
+            if now >= self.duration:
+                return None
+            if due > now:
+                return min(due, self.duration)
+            
+            try:
+                delay = next(steps)
+            except StopIteration:
+                heapq.heappop(queue)
+                continue
+            heapq.heapreplace(queue, (now + delay, index, steps))
+        return None
+    
+    def wait_time(self, target):
+        # 距模拟时间target还需等待的真实秒数，暂停时返回None（一直等到控制状态变化）
+        with self.condition:
+            if self.paused:
+                return None
+            return max(0.0, (target - self.virtual_time()) / self.speed)
+    
+    def end(self):
+        with self.condition:
+            self.now = min(self.virtual_time(), self.duration)
+        for _, _, steps in self.queue:
+            steps.close()
+        # 只有正常结束才收尾，主动停止或任务全部被移除时不再发送完成信号
+        active_tasks = [task for task in self.tasks if task not in self.removed]
+        if self.running and active_tasks:
+            for task in active_tasks:
+                task.finish(self)
+            self.finished.emit()
+    
+    def run(self):
+        # 在当前线程中阻塞运行到结束
+        self.begin()
+        while True:
+            target = self.advance()
+            if target is None:
+                break
+            # 在锁内重新计算等待时间：之前发生的调速和暂停已经生效，之后发生的会立即唤醒等待
+            with self.condition:
+                if self.running:
+                    timeout = self.wait_time(target)
+                    if timeout is None or timeout > 0:
+                        self.condition.wait(timeout)
+        self.end()
+    
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+# 预定义的代码和日志片段（模块加载时构建一次，由SnippetIndex编入索引）；含{字段}的是动态片段，见TEMPLATE_FIELD_PATTERN
+CODE_SNIPPETS = {
+    'compilation': [
+        'gcc -O2 -c main.c',
+        'In file included from main.c:5:',
+        'header.h:12: warning: implicit declaration of function',
+        'Linking object files...',
+        'Creating executable: output.exe',
+        'ld: warning: -z relro reduced flexibility',
+        '[{arrow:28}] {percent}% Compiling core modules...',
+        '[{arrow:28}] {percent}% Optimizing memory access...'
+    ],
+    'model_training': [
+        'Epoch {epoch}/100',
+        '500/500 [==============================] - {epoch_seconds}s {step_ms}ms/step - loss: {loss:.4} - accuracy: {accuracy:.4}',
+        'Epoch {epoch}/100 - learning rate: {learning_rate:.6}',
+        '500/500 [==============================] - {epoch_seconds}s {step_ms}ms/step - loss: {loss:.4} - accuracy: {accuracy:.4}',
+        'Optimizer: Adam learning rate: 0.001',
+        'Layers: 4 Hidden units: 256, 128, 64, 32',
+        'Processing... {blocks:10} {percent}% - Batch normalization applied',
+        'Checkpoint saved at epoch {epoch}'
+    ],
+    'data_mining': [
+        'Loading dataset: {records:,}/1,234,567 records',
+        'Extracting features from raw data...',
+        'Applying dimensionality reduction (PCA)...',
+        'Clustering with K-means: K=8',
+        'Calculating information entropy...',
+        'Correlation matrix computed: {correlation:.3}',
+        '[{arrow:28}] {percent}% - Pattern recognition in progress',
+        'Found {anomalies} anomalies in the dataset'
+    ],
+    'system_optimization': [
+        'Scanning system files...',
+        'Defragmenting memory allocation tables: {memory:.2} GiB in use',
+        'Optimizing kernel parameters...',
+        'Adjusting CPU scheduling priorities',
+        'Updating system cache policies',
+        'Benchmark results: {iops} IOPS',
+        'Performance improved by {improvement:.1}%',
+        '[{arrow:30}] {percent}% - Finalizing system configurations'
+    ],
+    'model_initialization': [
+        'Importing TensorFlow/PyTorch modules',
+        'Defining model architecture...',
+        'Setting up loss functions and metrics',
+        'Configuring callbacks: EarlyStopping, ModelCheckpoint',
+        'Preparing dataset for training',
+        'Initializing weights with Xavier uniform distribution',
+        'Building computation graph...',
+        'Model summary: 2,567,890 parameters'
+    ],
+    'flux_model_repair': [
+        'Self-check protocol initiated',
+        'Scanning model components...',
+        'Error detected in attention mechanism',
+        'Initiating auto-repair sequence',
+        'Reconstructing model layers 3-7',
+        'Validating model integrity...',
+        'Repair progress: {blocks:11} {percent}%',
+        'Attention mechanism restored successfully'
+    ],
+    'errors': [
+        'ERROR: Memory allocation failed in layer 4',
+        'WARNING: Training loss increased unexpectedly',
+        'CRITICAL: Connection timeout with data server',
+        'ERROR: CUDA out of memory. Trying to reduce batch size...',
+        'WARNING: NAN values detected in gradient',
+        'ERROR: File not found: weights.h5'
+    ],
+    'fixes': [
+        'Applying workaround: Memory fragmentation reduced',
+        'Solution: Adjusting learning rate scheduler',
+        'Retrying connection with backup server...',
+        'Successfully reduced batch size to 16',
+        'Gradient clipping applied to prevent NAN values',
+        'Loading weights from backup file: weights_bak.h5',
+        'Fix applied successfully!',
+        'System recovered from critical error'
+    ],
+    'progress': [
+        '[{bar:22}] {percent}%',
+        'Processing... {blocks:13} {percent}%'
+    ]
+}
+
+MODULES = [
+    'Neural Network Optimization',
+    'Data Preprocessing Pipeline',
+    'Feature Engineering',
+    'Hyperparameter Tuning',
+    'Cross-Validation',
+    'Model Ensemble',
+    'Performance Benchmarking',
+    'System Integration'
+]
+
+# 执行模式（配置窗口中的文字） -> 该模式下主要的日志类别
+MODES = {
+    '正在编译中，请勿关闭窗口': 'compilation',
+    '正在训练模型，预计XX:XX:XX完成': 'model_training',
+    '深度数据挖掘中，请勿触碰输入设备': 'data_mining',
+    '系统内核优化进行时，避免移动鼠标': 'system_optimization',
+    '模型定义构建初始化中...': 'model_initialization',
+    '检测到FLUX大模型损坏，自检协议运行中..请勿触碰输入设备。': 'flux_model_repair',
+}
+# 执行时长限制在1秒到MAX_DURATION之间（窗口版和终端版相同）
+MAX_DURATION = 24 * 3600  # seconds
+# 正常日志的类别；当前模式的主要类别占正常日志的比例，其余类别平分剩下的部分
+NORMAL_CATEGORIES = list(MODES.values())
+PRIMARY_CATEGORY_WEIGHT = 0.6
+# 执行完成时追加的日志，也收录在共享日志表中
+FINISHED_LOGS = [
+    ('\n========================================', 'progress'),
+    ('任务执行完毕！系统已恢复正常状态。', 'success'),
+    ('所有模块已成功完成。', 'success'),
+    ('========================================\n', 'progress'),
+]
+# 日志生成每次预先抽取的步数：行动、各类随机选择、等待时间和正常日志都按块一次性生成
+RANDOM_BLOCK_SIZE = 256
+# 每一步之后随机的滚动速度
+SLEEP_TIMES = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 3.0)  # seconds
+
+# 动态片段：片段中的 {字段} 或 {字段:格式} 在生成时按当时的进度填入，每个片段只在建立索引时解析一次。
+# 字段值都是整数：格式为空时直接显示，','带千位分隔符，'.N'是保留N位小数的定点数（字段值是实际值乘以10**N），
+# arrow/bar/blocks是按percent绘制的进度条，格式是进度条的宽度
+TEMPLATE_FIELD_PATTERN = re.compile(r'\{(\w+)(?::([^}]*))?\}')
+# 进度条字段 -> (已完成部分的字符, 末端字符, 未完成部分的字符)
+TEMPLATE_BARS = {'arrow': ('=', '>', ' '), 'bar': ('=', '', ' '), 'blocks': ('█', '', '░')}
+# 与片段中的固定文字对应：训练轮数、数据集记录数、内存总量
+TEMPLATE_EPOCHS = 100
+TEMPLATE_RECORDS = 1234567
+TEMPLATE_MEMORY_GIB = 16
+# 字段由以下特征线性组合后取整：常数1、三个进度条的百分比、三个[0, 1)之间的随机数、
+# 训练衰减系数exp(-3 * 主进度)及其与前两个随机数之积、学习率的余弦衰减系数
+TEMPLATE_FEATURES = ('one', 'main', 'load', 'memory', 'u0', 'u1', 'u2', 'decay', 'decay_u0', 'decay_u1', 'cosine')
+TEMPLATE_FIELDS = {
+    'percent': {'main': 1},
+    'epoch': {'one': 1, 'main': (TEMPLATE_EPOCHS - 1) / 100},
+    'loss': {'one': 500, 'decay': 5400, 'decay_u0': 1200},  # 0.05 + 0.6 × 衰减 × (0.9~1.1)
+    'accuracy': {'one': 10000, 'decay': -4050, 'decay_u1': -900},  # 1 - 0.45 × 衰减 × (0.9~1.1)
+    'learning_rate': {'one': 501, 'cosine': 499.5},  # 0.001按余弦衰减到0.000001；多出的0.5由取整截去，最大正好是0.001
+    'step_ms': {'one': 25, 'u2': 10},
+    'epoch_seconds': {'one': 12.5, 'u2': 5},  # 每轮500步
+    'records': {'load': TEMPLATE_RECORDS / 100},
+    'anomalies': {'load': 0.2, 'u0': 3},
+    'correlation': {'one': 800, 'u1': 150},
+    'iops': {'one': 11000, 'u2': 3000},
+    'improvement': {'main': 1.5, 'u0': 20},
+    'memory': {'memory': TEMPLATE_MEMORY_GIB},
+}
+TEMPLATE_FIELDS_ORDER = tuple(TEMPLATE_FIELDS)
+TEMPLATE_FIELD_INDEX = {field: index for index, field in enumerate(TEMPLATE_FIELDS_ORDER)}
+TEMPLATE_NOISE_COLUMNS = 3
+# 取值只有约100种的字段：只由这些字段组成的片段（进度条、轮数）缓存渲染结果，几乎总是命中；
+# 其他片段带有随机数或连续变化的数值，很少重复，每次直接渲染
+TEMPLATE_CACHED_FIELDS = {'percent', 'epoch'}
+
+def template_weights():
+    # 特征 -> 字段的系数矩阵，形状为 (len(TEMPLATE_FEATURES), len(TEMPLATE_FIELDS))
+    return np.array([[TEMPLATE_FIELDS[field].get(feature, 0) for field in TEMPLATE_FIELDS] for feature in TEMPLATE_FEATURES])
+
+def template_values(progress, noise, weights):
+    # 一组时间点上的全部字段值：先拼出特征矩阵（列顺序与TEMPLATE_FEATURES一致），一次矩阵乘法得到
+    # progress: (N, 3) 三个进度条的百分比；noise: (N, TEMPLATE_NOISE_COLUMNS) [0, 1)之间的随机数
+    # 返回形状为 (N, len(TEMPLATE_FIELDS)) 的整数数组
+    main = progress[:, 0] / 100
+    decay = np.exp(-3 * main)
+    features = np.empty((len(progress), len(TEMPLATE_FEATURES)))
+    features[:, 0] = 1
+    features[:, 1:4] = progress
+    features[:, 4:7] = noise
+    features[:, 7] = decay
+    features[:, 8:10] = decay[:, None] * noise[:, :2]
+    features[:, 10] = np.cos(np.pi * main)
+    return (features @ weights).astype(np.int64)
+
+def template_renderer(name, spec):
+    # 返回把整数字段值转为文本的函数；进度条预先画好0~100%全部101种
+    if name in TEMPLATE_BARS:
+        width = int(spec)
+        done, head, rest = TEMPLATE_BARS[name]
+        bars = []
+        for percent in range(101):
+            filled = percent * width // 100
+            bar = done * (filled - 1) + head if head and 0 < filled < width else done * filled
+            bars.append(bar + rest * (width - len(bar)))
+        return tuple(bars).__getitem__
+    if not spec:
+        return str
+    if spec == ',':
+        return '{:,}'.format
+    if spec.startswith('.'):
+        digits = int(spec[1:])
+        text_format = f'%d.%0{digits}d'
+        scale = 10 ** digits
+        return lambda value: text_format % divmod(value, scale)
+    raise ValueError(f'unknown template format: {{{name}:{spec}}}')
+
+def template_parser(name, spec):
+    # template_renderer的逆运算，返回 (匹配该字段文本的正则, 把文本转回字段值的函数)；
+    # 执行记录据此只保存字段值。进度条由百分比决定，不是有效的进度条时转换结果为None
+    if name in TEMPLATE_BARS:
+        renderer = template_renderer(name, spec)
+        return f'(.{{{int(spec)}}})', {renderer(percent): percent for percent in range(101)}.get
+    if not spec:
+        return r'(\d+)', int
+    if spec == ',':
+        return r'(\d{1,3}(?:,\d{3})*)', lambda text: int(text.replace(',', ''))
+    if spec.startswith('.'):
+        return rf'(\d+\.\d{{{int(spec[1:])}}})', lambda text: int(text.replace('.', ''))
+    raise ValueError(f'unknown template format: {{{name}:{spec}}}')
+
+class LogTemplate:
+    # 编译好的动态片段：文本在字段处切开，每个字段预先选好转换函数，渲染只需取值、查表和一次拼接
+    def __init__(self, text):
+        self.parts = []
+        self.slots = []  # (在parts中的位置, 转换函数)
+        self.parsers = []  # 与slots一一对应，把渲染出的文本转回字段值
+        pattern = []
+        indices = []
+        position = 0
+        for match in TEMPLATE_FIELD_PATTERN.finditer(text):
+            name, spec = match.groups()
+            self.parts.append(text[position:match.start()])
+            self.slots.append((len(self.parts), template_renderer(name, spec)))
+            self.parts.append('')
+            field_pattern, parser = template_parser(name, spec)
+            pattern += [re.escape(text[position:match.start()]), field_pattern]
+            self.parsers.append(parser)
+            indices.append(TEMPLATE_FIELD_INDEX['percent' if name in TEMPLATE_BARS else name])
+            position = match.end()
+        self.parts.append(text[position:])
+        pattern.append(re.escape(text[position:]))
+        # 匹配本片段任意一次渲染结果的正则（不含分组名，可以嵌入SnippetIndex的合并正则）
+        self.pattern = ''.join(pattern)
+        self.regex = re.compile(self.pattern)
+        # 从一行字段值中取出本片段用到的值；只有一个字段时取两次，结果同样是元组（zip按较短的一方结束）
+        self.values = operator.itemgetter(*indices) if len(indices) > 1 else operator.itemgetter(indices[0], indices[0])
+        self.cache = {} if {TEMPLATE_FIELDS_ORDER[index] for index in indices} <= TEMPLATE_CACHED_FIELDS else None
+    
+    def render(self, row):
+        # row: template_values的一行（列表）
+        values = self.values(row)
+        cache = self.cache
+        if cache is not None:
+            text = cache.get(values)
+            if text is not None:
+                return text
+        text = self.format(values)
+        if cache is not None:
+            cache[values] = text
+        return text
+    
+    def format(self, values):
+        # values: 与slots一一对应的字段值（多出的部分忽略）
+        parts = self.parts.copy()
+        for (slot, renderer), value in zip(self.slots, values):
+            parts[slot] = renderer(value)
+        return ''.join(parts)
+    
+    def parse(self, text):
+        # format的逆运算：text是本片段的一次渲染结果时返回各字段值，否则返回None；
+        # 按取回的值重新渲染必须得到原文，保证回放的文本与记录时完全相同
+        match = self.regex.fullmatch(text)
+        if match is None:
+            return None
+        values = tuple(parser(group) for parser, group in zip(self.parsers, match.groups()))
+        if None in values or self.format(values) != text:
+            return None
+        return values
+
+class SnippetIndex:
+    # 预编译的片段索引：所有片段放进一个扁平的元组，按整数ID访问，同时也是各线程共享的只读日志表；
+    # 每种模式预先算好累积权重表，单次采样是一次二分查找，批量采样是一次向量化调用
+    def __init__(self, snippets):
+        texts = []
+        self.categories = {}  # category -> (start_id, end_id)
+        for category, lines in snippets.items():
+            start = len(texts)
+            texts.extend(sys.intern(line) for line in lines)
+            self.categories[category] = (start, len(texts))
+        # 完成日志放在片段之后，不属于任何类别
+        self.finished = [log_entry(len(texts) + index, color_type) for index, (_, color_type) in enumerate(FINISHED_LOGS)]
+        texts.extend(text for text, _ in FINISHED_LOGS)
+        self.texts = tuple(texts)
+        # 动态片段：文本ID -> 编译好的模板，表中保存的是模板原文
+        self.templates = {text_id: LogTemplate(text) for text_id, text in enumerate(self.texts)
+                          if TEMPLATE_FIELD_PATTERN.search(text)}
+        # 全部动态片段合成一个正则，分组名是文本ID，用于把渲染结果还原为片段和字段值
+        self.template_pattern = re.compile('|'.join(f'(?P<t{text_id}>{template.pattern})'
+                                                    for text_id, template in self.templates.items()))
+        
+        load_numpy()
+        self.is_template = np.array([text_id in self.templates for text_id in range(len(self.texts))])
+        self.template_weights = template_weights()
+        self.tables = {mode: self.build_table(mode) for mode in [None] + NORMAL_CATEGORIES}
+    
+    def build_table(self, mode):
+        # 返回 (片段ID数组, 归一化的累积权重数组)；mode为None时各类别等权
+        if mode is None:
+            weights = {category: 1 / len(NORMAL_CATEGORIES) for category in NORMAL_CATEGORIES}
+        else:
+            other_weight = (1 - PRIMARY_CATEGORY_WEIGHT) / (len(NORMAL_CATEGORIES) - 1)
+            weights = {category: other_weight for category in NORMAL_CATEGORIES}
+            weights[mode] = PRIMARY_CATEGORY_WEIGHT
+        ids = []
+        snippet_weights = []
+        for category in NORMAL_CATEGORIES:
+            start, end = self.categories[category]
+            ids.extend(range(start, end))
+            snippet_weights += [weights[category] / (end - start)] * (end - start)
+        cumulative = np.cumsum(snippet_weights)
+        cumulative /= cumulative[-1]
+        return np.array(ids), cumulative
+    
+    def sample(self, mode, u):
+        # u是[0, 1)之间的随机数
+        ids, cumulative = self.tables[mode]
+        return int(ids[bisect.bisect_right(cumulative, u)])
+    
+    def sample_batch(self, mode, size, rng):
+        ids, cumulative = self.tables[mode]
+        return ids[np.searchsorted(cumulative, rng.random(size), side='right')]
+    
+    def category(self, category):
+        start, end = self.categories[category]
+        return self.texts[start:end]
+    
+    def entries(self, category, color_type):
+        # 一个类别的全部片段按指定颜色打包好的日志条目
+        start, end = self.categories[category]
+        return [log_entry(text_id, color_type) for text_id in range(start, end)]
+    
+    def match_template(self, text):
+        # 文本是某个动态片段的渲染结果时返回 (文本ID, 字段值)，否则返回None
+        match = self.template_pattern.fullmatch(text)
+        if match is None:
+            return None
+        text_id = int(match.lastgroup[1:])
+        values = self.templates[text_id].parse(text)
+        return None if values is None else (text_id, values)
+
+snippet_index = None
+
+def load_snippet_index():
+    global snippet_index
+    if snippet_index is None:
+        snippet_index = SnippetIndex(CODE_SNIPPETS)
+    return snippet_index
+
+# 外部语料单行最多读取的字节数，超长的行会被截断
+CORPUS_MAX_LINE_BYTES = 4096
+# 随机采样时遇到空行最多重试的次数
+CORPUS_SAMPLE_RETRIES = 8
+CORPUS_ERROR_PATTERN = re.compile(r'\b(ERROR|CRITICAL|FATAL|FAILED|EXCEPTION|TRACEBACK|WARN|WARNING)\b', re.IGNORECASE)
+CORPUS_PROGRESS_PATTERN = re.compile(r'\d{1,3}(\.\d+)?%')
+# 非空白字节，用于在打开语料时找到第一行非空白文本
+CORPUS_TEXT_PATTERN = re.compile(rb'\S')
+
+class LogCorpus:
+    # 外部日志语料：文件以只读方式内存映射，不整体读入内存。
+    # 随机采样时在随机字节位置向后找到下一行的开头，所以启动时间与文件大小无关，
+    # 常驻内存只随实际访问过的页增长；回放时从头按行顺序读取，读完后循环
+    def __init__(self, paths):
+        self.files = []
+        self.maps = []
+        try:
+            for path in paths:
+                f = open(path, 'rb')
+                self.files.append(f)
+                # 空文件无法映射，直接跳过；只有空白行的文件也跳过，全部跳过时语料为空，由调用方改用内置日志
+                if os.fstat(f.fileno()).st_size > 0:
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if self.has_text(mapping):
+                        self.maps.append(mapping)
+                    else:
+                        mapping.close()
+        except OSError:
+            self.close()
+            raise
+        # 按文件大小加权选择文件
+        self.cumulative_sizes = []
+        total = 0
+        for mapping in self.maps:
+            total += len(mapping)
+            self.cumulative_sizes.append(total)
+    
+    def __bool__(self):
+        return bool(self.maps)
+    
+    def has_text(self, mapping):
+        # 是否至少有一行非空白文本（与回放时的判断相同）；只扫描到第一行非空白文本为止，大文件也能立即返回
+        for match in CORPUS_TEXT_PATTERN.finditer(mapping):
+            text, _ = self.read_line(mapping, mapping.rfind(b'\n', 0, match.start()) + 1)
+            if text.strip():
+                return True
+        return False
+    
+    def read_line(self, mapping, start):
+        # 返回 (行文本, 下一行开头的位置)
+        end = mapping.find(b'\n', start, start + CORPUS_MAX_LINE_BYTES)
+        if end == -1:
+            end = min(len(mapping), start + CORPUS_MAX_LINE_BYTES)
+            next_start = mapping.find(b'\n', end)
+            next_start = len(mapping) if next_start == -1 else next_start + 1
+        else:
+            next_start = end + 1
+        text = mapping[start:end].decode('utf-8', 'replace').rstrip('\r').expandtabs(4)
+        return text, next_start
+    
+    def random_line(self, rng):
+        # 返回 (text, color_type)
+        for _ in range(CORPUS_SAMPLE_RETRIES):
+            offset = int(rng.random() * self.cumulative_sizes[-1])
+            file_index = bisect.bisect_right(self.cumulative_sizes, offset)
+            mapping = self.maps[file_index]
+            position = offset - (self.cumulative_sizes[file_index - 1] if file_index else 0)
+            # 从随机位置向后对齐到下一行开头，到文件末尾时从头开始
+            newline = mapping.find(b'\n', position)
+            start = 0 if newline == -1 or newline + 1 >= len(mapping) else newline + 1
+            text, _ = self.read_line(mapping, start)
+            if text.strip():
+                break
+        return text, self.classify(text)
+    
+    def replay(self):
+        # 按顺序逐行产出 (text, color_type)，所有文件读完后从头循环；
+        # 完整读一遍都没有非空白的行时不能继续循环，否则调度线程会在这里空转
+        while True:
+            found = False
+            for mapping in self.maps:
+                position = 0
+                while position < len(mapping):
+                    text, position = self.read_line(mapping, position)
+                    if text.strip():
+                        found = True
+                        yield text, self.classify(text)
+            if not found:
+                raise ValueError('语料中没有非空白的行')
+    
+    def classify(self, text):
+        if CORPUS_ERROR_PATTERN.search(text):
+            return 'error'
+        if CORPUS_PROGRESS_PATTERN.search(text):
+            return 'progress'
+        return 'normal'
+    
+    def close(self):
+        for mapping in self.maps:
+            mapping.close()
+        for f in self.files:
+            f.close()
+        self.maps = []
+        self.files = []
+
+class LogGenerator:
+    def __init__(self, duration, mode=None, seed=None, corpus=None, corpus_replay=False, progress=None):
+        self.new_logs = Event()  # (entries, extra)，格式见LOG_COLOR_BITS上方的说明
+        self.module_change = Event()  # module_name
+        self.duration = duration  # seconds
+        self.mode = mode if mode in NORMAL_CATEGORIES else None  # 主要日志类别，见MODES
+        self.pending_logs = []
+        self.pending_extra = []
+        self.batch_start = 0.0
+        self.index = load_snippet_index()
+        self.texts = self.index.texts
+        # 动态片段按进度管理（ProgressManager）的进度轨迹取值，未提供时按时间线性估计
+        self.progress = progress
+        self.log_time = 0.0  # 按本生成器自己的等待时间累计的模拟时间（seconds）
+        # 每个组件使用自己的生成器，不与其他线程共享random模块的全局状态；相同种子得到完全相同的日志序列
+        self.rng = np.random.default_rng(seed)
+        # 提供外部语料时，正常日志改为从语料中随机采样或按顺序回放
+        self.corpus = corpus if corpus else None
+        self.corpus_lines = corpus.replay() if self.corpus and corpus_replay else None
+    
+    def draw_block(self):
+        # 一次抽取RANDOM_BLOCK_SIZE步要用到的全部随机数，逐步取用
+        # 每步是 (行动, 选择, 修复选择, 错误后的等待, 等待时间, 片段)，片段是这一步的进度日志或正常日志：
+        # 静态片段是日志条目，动态片段是已经渲染好的文本
+        size = RANDOM_BLOCK_SIZE
+        rng = self.rng
+        index = self.index
+        actions = rng.random(size)
+        picks = rng.random(size)
+        error_waits = rng.uniform(0.5, 1.5, size)
+        sleep_times = rng.choice(SLEEP_TIMES, size)
+        # 进度日志按选择从进度类别中取，正常日志按当前模式的权重采样；片段ID整块移位、加上颜色ID即得到日志条目
+        start, end = index.categories['progress']
+        progress = actions < 0.15
+        snippet_ids = np.where(progress, start + (picks * (end - start)).astype(int),
+                               index.sample_batch(self.mode, size, rng))
+        snippets = ((snippet_ids << LOG_COLOR_BITS) | np.where(progress, LOG_COLOR_IDS['progress'], 0)).tolist()
+        
+        # 每步开始时的模拟时间按本块的等待（切换模块0.5秒、错误后的等待、滚动间隔）预先累计，
+        # 动态片段的字段在这些时间点上一次算好；不取实际调度的时间，相同种子得到相同的日志
+        waits = sleep_times + np.where(actions < 0.03, 0.5, np.where(actions < 0.08, error_waits, 0.0))
+        times = self.log_time + np.cumsum(waits) - waits
+        self.log_time += float(waits.sum())
+        # 只为会显示动态片段的步骤计算字段值（使用外部语料时正常日志不取片段）
+        shown = actions >= 0.08
+        if self.corpus is not None:
+            shown &= progress
+        rows = np.flatnonzero(shown & index.is_template[snippet_ids])
+        if len(rows):
+            noise = rng.random((len(rows), TEMPLATE_NOISE_COLUMNS))
+            values = template_values(self.progress_at(times[rows]), noise, index.template_weights)
+            templates = index.templates
+            for row, row_values in zip(rows.tolist(), values.tolist()):
+                snippets[row] = templates[snippets[row] >> LOG_COLOR_BITS].render(row_values)
+        return zip(actions.tolist(),
+                   picks.tolist(),
+                   rng.random(size).tolist(),
+                   error_waits.tolist(),
+                   sleep_times.tolist(),
+                   snippets)
+    
+    def progress_at(self, times):
+        if self.progress is not None:
+            return self.progress.progress_at(times)
+        percent = np.minimum(times / (self.duration or 1) * 100, 100)
+        return np.repeat(percent[:, None], 3, axis=1)
+    
+    def emit_log(self, entry):
+        # 先放入缓冲区，由flush_logs统一发送，避免每行一次跨线程信号
+        if not self.pending_logs:
+            self.batch_start = time.monotonic()
+        self.pending_logs.append(entry)
+    
+    def emit_text(self, text, color_type):
+        # 不在共享日志表中的行随批次附带文本
+        self.emit_log(~len(self.pending_extra) << LOG_COLOR_BITS | LOG_COLOR_IDS[color_type])
+        self.pending_extra.append(text)
+    
+    def flush_logs(self):
+        if self.pending_logs:
+            entries, extra = self.pending_logs, self.pending_extra
+            self.pending_logs = []
+            self.pending_extra = []
+            self.new_logs.emit(entries, extra)
+    
+    def wait(self, seconds):
+        # 即将长时间等待、批次已积累足够久或足够多时先发送，保持原有的滚动节奏
+        if self.pending_logs and (seconds >= LOG_BATCH_INTERVAL
+                                  or len(self.pending_logs) >= LOG_BATCH_SIZE
+                                  or time.monotonic() - self.batch_start >= LOG_BATCH_INTERVAL):
+            self.flush_logs()
+        return seconds
+    
+    def steps(self, clock):
+        errors = self.index.entries('errors', 'error')
+        fixes = self.index.entries('fixes', 'success')
+        
+        while True:
+            for action, pick, fix_pick, error_wait, sleep_time, snippet in self.draw_block():
+                # 随机决定当前的行动
+                if action < 0.03:  # 3% 概率切换模块
+                    module = MODULES[int(pick * len(MODULES))]
+                    # 保证模块分隔符出现在之前的日志之后
+                    self.flush_logs()
+                    self.module_change.emit(module)
+                    yield self.wait(0.5)
+                elif action < 0.08:  # 5% 概率显示错误
+                    self.emit_log(errors[int(pick * len(errors))])
+                    # 通常错误后会有修复
+                    yield self.wait(error_wait)
+                    self.emit_log(fixes[int(fix_pick * len(fixes))])
+                elif action < 0.15:  # 7% 概率显示进度
+                    if type(snippet) is str:
+                        self.emit_text(snippet, 'progress')
+                    else:
+                        self.emit_log(snippet)
+                else:  # 85% 概率显示正常日志，当前模式对应的类别更常出现
+                    if self.corpus_lines is not None:
+                        self.emit_text(*next(self.corpus_lines))
+                    elif self.corpus is not None:
+                        self.emit_text(*self.corpus.random_line(self.rng))
+                    elif type(snippet) is str:
+                        self.emit_text(snippet, 'normal')
+                    else:
+                        self.emit_log(snippet)
+                
+                # 随机的滚动速度
+                yield self.wait(sleep_time)
+    
+    def finish(self, clock):
+        self.flush_logs()
+
+# 进度曲线采样参数：每隔约0.1秒一个采样点，总数有上限，超长时长时自动放宽间隔
+PROGRESS_SAMPLE_INTERVAL = 0.1  # seconds
+PROGRESS_MAX_SAMPLES = 10000
+# 两次刷新之间的最短间隔，最长间隔由时钟标签决定（1秒）
+PROGRESS_MIN_INTERVAL = 0.02  # seconds
+
+class ProgressManager:
+    def __init__(self, duration, seed=None):
+        self.progress_update = Event()  # (main_progress, secondary1_progress, secondary2_progress)
+        self.time_update = Event()  # (elapsed_time, remaining_time)
+        self.duration = duration  # seconds
+        load_numpy()
+        self.rng = np.random.default_rng(seed)
+        # 随机生成其他两个进度条的目标时间（在0.5T到1.5T之间）
+        self.secondary1_time, self.secondary2_time = duration * self.rng.uniform(0.5, 1.5, 2)
+        # 启动前一次性算好整条进度轨迹，每次刷新只需查表
+        self.curves = self.build_curves()
+        self.sample_step = duration / (len(self.curves) - 1)
+        self.next_change = self.build_next_change()
+    
+    def build_curves(self):
+        # 返回形状为 (N, 4) 的数组，每行是 (time, main, secondary1, secondary2)
+        samples = min(int(self.duration / PROGRESS_SAMPLE_INTERVAL), PROGRESS_MAX_SAMPLES) + 1
+        times = np.linspace(0.0, self.duration, samples)
+        curves = np.empty((samples, 4))
+        curves[:, 0] = times
+        curves[:, 1] = times / self.duration * 100
+        curves[:, 2] = self.stall_curve(times) / self.secondary1_time * 100
+        curves[:, 3] = self.stall_curve(times) / self.secondary2_time * 100
+        np.minimum(curves[:, 1:], 100, out=curves[:, 1:])
+        return curves
+    
+    def build_next_change(self):
+        # 对每个采样点，预先算出之后第一个任一进度条整数值发生变化的采样点下标
+        values = self.curves[:, 1:].astype(int)
+        changes = np.flatnonzero((values[1:] != values[:-1]).any(axis=1)) + 1
+        changes = np.append(changes, len(values) - 1)
+        return changes[np.searchsorted(changes, np.arange(len(values)), side='right').clip(max=len(changes) - 1)]
+    
+    def progress_at(self, times):
+        # 一组模拟时间点上三个进度条的百分比，形状为 (N, 3)，与steps相同地查表
+        indices = np.minimum((times / self.sample_step).astype(int), len(self.curves) - 1)
+        return self.curves[indices, 1:]
+    
+    def stall_curve(self, times):
+        # 随机生成一些卡顿点：到达卡顿点后进度停住一段时间（0.01T到0.03T），
+        # 其余时间略微加速，使整体仍在T时刻走完T的进度，曲线单调不回退
+        points = np.sort(self.rng.uniform(0.1, 0.9, 3)) * self.duration
+        stalls = self.rng.uniform(0.1, 0.3, 3) * self.duration * 0.1
+        knot_times = [0.0]
+        for point, stall in zip(points, stalls):
+            begin = max(point, knot_times[-1])
+            knot_times += [begin, begin + stall]
+        knot_times.append(max(self.duration, knot_times[-1]))
+        knot_times = np.array(knot_times)
+        
+        # 偶数段正常前进，奇数段是卡顿
+        spans = np.diff(knot_times)
+        moving = spans.copy()
+        moving[1::2] = 0.0
+        rate = self.duration / moving.sum()
+        knot_values = np.concatenate(([0.0], np.cumsum(moving * rate)))
+        return np.interp(times, knot_times, knot_values)
+    
+    def steps(self, clock):
+        last_progress = None
+        last_second = None
+        while True:
+            elapsed = clock.elapsed()
+            
+            # 查表得到当前进度
+            index = min(int(elapsed / self.sample_step), len(self.curves) - 1)
+            progress = tuple(int(value) for value in self.curves[index, 1:])
+            
+            # 只在显示的数值变化时更新进度
+            if progress != last_progress:
+                last_progress = progress
+                self.progress_update.emit(*progress)
+            
+            # 时间只显示到秒，每秒更新一次
+            second = int(elapsed)
+            if second != last_second:
+                last_second = second
+                elapsed_time = format_time(elapsed)
+                remaining = max(0, self.duration - elapsed)
+                remaining_time = format_time(remaining)
+                self.time_update.emit(elapsed_time, remaining_time)
+            
+            # 下次在下一个整秒或任一进度条数值变化时醒来，取较早者
+            next_time = min(second + 1, self.curves[self.next_change[index], 0])
+            yield max(next_time - elapsed, PROGRESS_MIN_INTERVAL)
+    
+    def finish(self, clock):
+        # 确保最终都到达100%
+        self.progress_update.emit(100, 100, 100)
+        elapsed_time = format_time(clock.elapsed())
+        self.time_update.emit(elapsed_time, '00:00:00')
+
+# 会话日志导出：写入线程攒够该大小（或等待超过刷新间隔）后一次写入
+SESSION_LOG_BUFFER_BYTES = 1024 * 1024
+SESSION_LOG_FLUSH_INTERVAL = 1.0  # seconds
+# 单个文件写入的未压缩字节数上限，超过后轮换；保留的历史文件数
+SESSION_LOG_MAX_BYTES = 64 * 1024 * 1024
+SESSION_LOG_BACKUPS = 5
+# 压缩方式 -> 文件后缀
+SESSION_LOG_COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+def open_compressed(path, compression):
+    # 以流式压缩方式打开文件用于写入；zstd使用Python 3.14自带的模块或可选的zstandard包
+    if compression == 'gzip':
+        return gzip.open(path, 'wb')
+    if compression == 'zstd':
+        try:
+            from compression import zstd
+            return zstd.open(path, 'wb')
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError('zstd压缩需要Python 3.14或安装zstandard') from None
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+    return open(path, 'wb')
+
+class SessionLog:
+    # 会话日志：把显示过的日志行写入文件。调用方只把行放进队列，由后台写入线程攒成大块后写入，
+    # 文件超过大小上限时轮换（name.log -> name.1.log -> ... -> name.N.log，最早的删除），总大小有上限
+    def __init__(self, path, texts, compression='gzip', max_bytes=SESSION_LOG_MAX_BYTES, backups=SESSION_LOG_BACKUPS):
+        self.texts = texts  # 日志来源的日志表，在写入线程中还原文本
+        self.compression = compression
+        self.suffix = SESSION_LOG_COMPRESSIONS[compression]
+        self.base, self.extension = os.path.splitext(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.SimpleQueue()
+        # 第一个文件在调用方线程中打开，路径或压缩方式有问题时立即报错
+        self.file = open_compressed(self.file_path(0), compression)
+        self.written = 0
+        self.thread = threading.Thread(target=self.run, name='session-log', daemon=True)
+        self.thread.start()
+    
+    def file_path(self, index):
+        name = self.base if index == 0 else f'{self.base}.{index}'
+        return name + self.extension + self.suffix
+    
+    def write_logs(self, entries, extra):
+        # 与new_logs的参数相同，文本在写入线程中还原
+        self.queue.put((entries, extra))
+    
+    def write_module(self, module_name):
+        self.queue.put(module_name)
+    
+    def run(self):
+        lines = []
+        size = 0
+        deadline = time.monotonic() + SESSION_LOG_FLUSH_INTERVAL
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ((), ())
+            if item is None:
+                break
+            # 队列中是 (entries, extra) 或模块名
+            if isinstance(item, str):
+                texts = ['', f'----- Starting Module: {item} -----']
+            else:
+                texts = [text for text, _ in resolve_logs(*item, self.texts)]
+            for text in texts:
+                lines.append(text)
+                size += len(text) + 1
+            # 攒够一块，或距上次写入已超过刷新间隔时写入
+            if size >= SESSION_LOG_BUFFER_BYTES or time.monotonic() >= deadline:
+                if lines:
+                    self.write('\n'.join(lines) + '\n')
+                    lines = []
+                    size = 0
+                deadline = time.monotonic() + SESSION_LOG_FLUSH_INTERVAL
+        if lines:
+            self.write('\n'.join(lines) + '\n')
+        self.file.close()
+    
+    def write(self, text):
+        data = text.encode('utf-8')
+        if self.written and self.written + len(data) > self.max_bytes:
+            self.rotate()
+        self.file.write(data)
+        self.written += len(data)
+    
+    def rotate(self):
+        self.file.close()
+        for index in range(self.backups, 0, -1):
+            source = self.file_path(index - 1)
+            if os.path.exists(source):
+                os.replace(source, self.file_path(index))
+        self.file = open_compressed(self.file_path(0), self.compression)
+        self.written = 0
+    
+    def close(self):
+        # 写完队列中剩余的行后关闭文件
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
@@ -0,0 +1,284 @@
+# 终端版执行器：与窗口版共用simulation_core中的日志生成和进度逻辑，不需要安装Qt
+#
+# 可以通过SSH或在没有图形界面的机器上运行，用ANSI转义序列绘制滚动日志和三个进度条：
+#     python terminal_simulation.py                       # 默认模式，执行5分钟
+#     python terminal_simulation.py --mode 2 --minutes 30 --seed 12345
+#
+# 每帧先在字符单元缓冲区中画好整屏，再与上一帧逐单元比较，只输出发生变化的部分。
+# 按 Ctrl+C 随时退出。
+import os
+import sys
+import time
+import shutil
+import argparse
+import unicodedata
+from collections import deque
+
+from simulation_core import (
+    Scheduler, LogGenerator, ProgressManager, LogCorpus, SessionLog, MODES, MAX_DURATION, SESSION_LOG_COMPRESSIONS,
+    load_numpy, load_snippet_index, resolve_logs, format_time, parse_time, spawn_seeds
+)
+
+# 样式 -> ANSI SGR参数，颜色与窗口版一致
+TERMINAL_STYLES = {
+    'normal': '32',
+    'error': '91',
+    'success': '32',
+    'progress': '93',
+    'module': '1;96',
+    'title': '1;38;5;202',
+    'finished': '1;92',
+    'label': '97',
+    'status': '37',
+    'bar0': '92',
+    'bar1': '94',
+    'bar2': '95',
+    'empty': '90',
+}
+TERMINAL_FRAME_INTERVAL = 1 / 30  # seconds，终端重绘间隔（真实时间）
+TERMINAL_LABEL_WIDTH = 14  # 进度条标签占的列数
+# 保留的日志行数，只要够铺满终端即可
+TERMINAL_LOG_LINES = 1000
+PROGRESS_BAR_LABELS = ('模型训练进度', '数据加载进度', '内存分配进度')
+
+# 终端进入和退出时的控制序列：备用屏幕、隐藏光标
+ENTER_SCREEN = '\x1b[?1049h\x1b[?25l\x1b[2J'
+LEAVE_SCREEN = '\x1b[0m\x1b[?25h\x1b[?1049l'
+
+def char_width(char):
+    # 中日韩全角字符占两列
+    return 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+
+def text_width(text):
+    return sum(char_width(char) for char in text)
+
+class TerminalScreen:
+    # 字符单元缓冲区：每个单元是 (字符, 样式)，全角字符后跟一个空字符串占位单元
+    def __init__(self, stream):
+        self.stream = stream
+        self.width = 0
+        self.height = 0
+        self.cells = []  # 上一帧已输出的内容
+    
+    def new_frame(self, width, height):
+        # 终端大小变化时清屏，下一次present整屏重绘
+        if (width, height) != (self.width, self.height):
+            self.width = width
+            self.height = height
+            self.cells = [[None] * width for _ in range(height)]
+            self.stream.write('\x1b[2J')
+        return [[(' ', '')] * width for _ in range(height)]
+    
+    def put(self, frame, row, column, text, style):
+        # 从(row, column)开始写入文本，超出行宽的部分截掉；返回写完后的列
+        if not 0 <= row < self.height:
+            return column
+        cells = frame[row]
+        for char in text:
+            width = char_width(char)
+            if column + width > self.width:
+                break
+            cells[column] = (char, style)
+            if width == 2:
+                cells[column + 1] = ('', style)
+            column += width
+        return column
+    
+    def present(self, frame):
+        # 每行中连续的变化单元输出为一段：移动光标，按需切换样式，写出字符
+        output = []
+        current_style = None
+        for row, (cells, previous) in enumerate(zip(frame, self.cells)):
+            if cells == previous:
+                continue
+            column = 0
+            while column < self.width:
+                if cells[column] == previous[column]:
+                    column += 1
+                    continue
+                start = column
+                # 从全角字符的占位单元开始时，从它的前一列写起
+                if cells[start][0] == '' and start > 0:
+                    start -= 1
+                end = column + 1
+                while end < self.width and (cells[end] != previous[end] or cells[end][0] == ''):
+                    end += 1
+                output.append(f'\x1b[{row + 1};{start + 1}H')
+                for char, style in cells[start:end]:
+                    if not char:
+                        continue
+                    if style != current_style:
+                        current_style = style
+                        output.append(f'\x1b[0;{TERMINAL_STYLES[style]}m' if style else '\x1b[0m')
+                    output.append(char)
+                column = end
+        self.cells = frame
+        if output:
+            output.append('\x1b[0m')
+            self.stream.write(''.join(output))
+            self.stream.flush()
+
+class TerminalView:
+    # 终端显示端：接收核心事件更新状态，作为调度器的一个任务按固定帧率重绘，只在状态变化后绘制
+    def __init__(self, mode, duration, texts, speed=1.0, stream=sys.stdout):
+        self.mode = mode
+        self.texts = texts  # 日志来源的日志表
+        self.duration = duration
+        self.title_style = 'title'
+        self.logs = deque(maxlen=TERMINAL_LOG_LINES)
+        self.progress = (0, 0, 0)
+        self.elapsed_time = '00:00:00'
+        self.remaining_time = format_time(duration)
+        self.speed = speed
+        # 预计完成时间每秒按剩余时间重新计算，标题中的占位符同步更新
+        self.mode_parts = mode.split('XX:XX:XX', 1) if '预计XX:XX:XX完成' in mode else None
+        self.expected_completion = self.completion_time(duration)
+        if self.mode_parts is not None:
+            self.mode = self.expected_completion.join(self.mode_parts)
+        self.screen = TerminalScreen(stream)
+        self.dirty = True
+    
+    def append_logs(self, entries, extra):
+        for text, color_type in resolve_logs(entries, extra, self.texts):
+            for line in text.split('\n'):
+                self.logs.append((line, color_type))
+        self.dirty = True
+    
+    def change_module(self, module_name):
+        self.logs.append(('', 'module'))
+        self.logs.append((f'----- Starting Module: {module_name} -----', 'module'))
+        self.dirty = True
+    
+    def update_progress(self, main_val, secondary1_val, secondary2_val):
+        self.progress = (main_val, secondary1_val, secondary2_val)
+        self.dirty = True
+    
+    def update_time(self, elapsed, remaining):
+        self.elapsed_time = elapsed
+        self.remaining_time = remaining
+        self.expected_completion = self.completion_time(parse_time(remaining))
+        if self.mode_parts is not None:
+            self.mode = self.expected_completion.join(self.mode_parts)
+        self.dirty = True
+    
+    def completion_time(self, remaining):
+        # 与窗口版相同：当前时间加上剩余的模拟时间按速度换算成的真实时间
+        return time.strftime('%H:%M:%S', time.localtime(time.time() + remaining / self.speed))
+    
+    def steps(self, clock):
+        while True:
+            if self.dirty:
+                self.render()
+            # 调度器按模拟时间计时，换算成固定的真实时间帧率
+            yield TERMINAL_FRAME_INTERVAL * clock.speed
+    
+    def finish(self, clock):
+        self.mode = '任务执行完毕！'
+        self.title_style = 'finished'
+        self.append_logs(load_snippet_index().finished, [])
+        self.render()
+    
+    def render(self):
+        # 布局：第一行标题，中间是日志，下面三个进度条，最后一行状态
+        self.dirty = False
+        columns, rows = shutil.get_terminal_size()
+        # 不使用最后一列，避免写到行尾时终端自动换行
+        width = max(1, columns - 1)
+        screen = self.screen
+        frame = screen.new_frame(width, rows)
+        
+        screen.put(frame, 0, max(0, (width - text_width(self.mode)) // 2), self.mode, self.title_style)
+        
+        log_rows = max(0, rows - 5)
+        visible = list(self.logs)[-log_rows:] if log_rows else []
+        for row, (text, color_type) in enumerate(visible, 1):
+            screen.put(frame, row, 0, text, color_type if color_type in TERMINAL_STYLES else 'normal')
+        
+        bar_width = max(0, width - TERMINAL_LABEL_WIDTH - 6)
+        for index, (label, value) in enumerate(zip(PROGRESS_BAR_LABELS, self.progress)):
+            row = rows - 4 + index
+            screen.put(frame, row, 0, label, 'label')
+            filled = value * bar_width // 100
+            column = screen.put(frame, row, TERMINAL_LABEL_WIDTH, '█' * filled, f'bar{index}')
+            column = screen.put(frame, row, column, '░' * (bar_width - filled), 'empty')
+            screen.put(frame, row, column, f' {value:3d}%', 'label')
+        
+        status = f'已运行: {self.elapsed_time} / 剩余: {self.remaining_time} / 预计完成: {self.expected_completion}'
+        screen.put(frame, rows - 1, 0, status, 'status')
+        screen.present(frame)
+
+def main():
+    modes = list(MODES)
+    parser = argparse.ArgumentParser(description='陈狗模型检测代码执行器（终端版）',
+                                     epilog='执行模式：' + '；'.join(f'{index}. {mode}' for index, mode in enumerate(modes, 1)))
+    parser.add_argument('--mode', type=int, default=1, choices=range(1, len(modes) + 1), help='执行模式编号')
+    parser.add_argument('--hours', type=int, default=0, help='执行时间（小时）')
+    parser.add_argument('--minutes', type=int, default=5, help='执行时间（分钟）')
+    parser.add_argument('--seconds', type=int, default=0, help='执行时间（秒）')
+    parser.add_argument('--speed', type=float, default=1.0, help='速度倍数')
+    parser.add_argument('--seed', type=int, help='随机种子，与窗口版相同种子的单窗口执行产生相同的日志')
+    parser.add_argument('--corpus', nargs='+', metavar='FILE', help='外部日志文件，作为日志语料')
+    parser.add_argument('--corpus-replay', action='store_true', help='按文件原有顺序回放语料')
+    parser.add_argument('--session-log', metavar='FILE', help='把全部日志保存到文件，按大小轮换')
+    parser.add_argument('--session-log-compression', default='gzip', choices=list(SESSION_LOG_COMPRESSIONS),
+                        help='会话日志的压缩方式')
+    args = parser.parse_args()
+    # 调度器同样会拒绝非正的速度，这里提前给出命令行用法错误
+    if args.speed <= 0:
+        parser.error('--speed 必须大于0')
+    
+    mode = modes[args.mode - 1]
+    # 与配置窗口相同，总时长限制在1秒到MAX_DURATION之间
+    duration = min(max(args.hours * 3600 + args.minutes * 60 + args.seconds, 1), MAX_DURATION)
+    
+    # 种子的派生方式与窗口版的单窗口执行相同
+    seed_sequence = load_numpy().random.SeedSequence(args.seed)
+    print(f'seed: {seed_sequence.entropy}', file=sys.stderr)
+    generator_seed, progress_seed, _ = spawn_seeds(seed_sequence.spawn(1)[0], 3)
+    
+    corpus = LogCorpus(args.corpus) if args.corpus else None
+    progress_manager = ProgressManager(duration, progress_seed)
+    generator = LogGenerator(duration, MODES[mode], generator_seed, corpus=corpus, corpus_replay=args.corpus_replay,
+                             progress=progress_manager)
+    view = TerminalView(mode, duration, generator.texts, args.speed)
+    generator.new_logs.connect(view.append_logs)
+    generator.module_change.connect(view.change_module)
+    progress_manager.progress_update.connect(view.update_progress)
+    progress_manager.time_update.connect(view.update_time)
+    session_log = None
+    if args.session_log:
+        session_log = SessionLog(args.session_log, generator.texts, args.session_log_compression)
+        generator.new_logs.connect(session_log.write_logs)
+        generator.module_change.connect(session_log.write_module)
+    
+    # 显示端最后加入，同一时刻的事件都处理完后再绘制
+    scheduler = Scheduler(duration)
+    scheduler.set_speed(args.speed)
+    for task in (generator, progress_manager, view):
+        scheduler.add_task(task)
+    finished = []
+    scheduler.finished.connect(lambda: finished.append(True))
+    
+    if sys.platform == 'win32':
+        # 让Windows控制台解析ANSI转义序列
+        os.system('')
+    sys.stdout.write(ENTER_SCREEN)
+    try:
+        scheduler.run()
+        # 与窗口版一样，完成后停留3秒
+        if finished:
+            if session_log is not None:
+                session_log.write_logs(load_snippet_index().finished, [])
+            time.sleep(3)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout.write(LEAVE_SCREEN)
+        sys.stdout.flush()
+        if session_log is not None:
+            session_log.close()
+        if corpus is not None:
+            corpus.close()
+
+if __name__ == '__main__':
+    main()